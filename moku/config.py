@@ -0,0 +1,46 @@
+import os
+import json
+import yaml
+
+#Use the libyaml C bindings for config I/O when available
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeLoader, SafeDumper
+
+
+def load_conf(path):
+    '''Load a yaml config, using a json sidecar cache when it is up to date'''
+    cache_path = path + '.json'
+    stat = os.stat(path)
+    #The sidecar records the modification time and size of the yaml it was made from. Both
+    #must match exactly: a newly copied conf file usually keeps its older source mtime
+    source = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+
+    try:
+        with open(cache_path, 'r') as file:
+            cache = json.load(file)
+        if cache.get('source') == source:
+            return cache['conf']
+    except (OSError, ValueError, AttributeError, KeyError):
+        pass
+
+    with open(path, 'r') as file:
+        conf = yaml.load(file, Loader=SafeLoader)
+
+    #Write the sidecar for subsequent runs; failure to cache is not fatal. Serialize first so a
+    #value json cannot represent leaves no truncated sidecar behind
+    try:
+        text = json.dumps({'source': source, 'conf': conf})
+        with open(cache_path, 'w') as file:
+            file.write(text)
+    except (OSError, TypeError, ValueError):
+        pass
+
+    return conf
+
+
+def save_conf(path, conf):
+    '''Save a config dict as yaml'''
+    with open(path, 'w') as file:
+        yaml.dump(conf, file, Dumper=SafeDumper)
@@ -1,30 +1,52 @@
 #test comment 
 import subprocess
-import yaml as yaml 
+import os
+import json
+import time
+from config import save_conf
 
-#Run mokucli list in command line and store output
-output = subprocess.run("mokucli list", capture_output=True, text=True)
+#Cache file for the parsed device list and how long it stays valid (s)
+DEVICE_CACHE = 'moku_device_list.json'
+DEVICE_CACHE_TTL = 60
 
-#Split output into words and remove header and formatting
-elements = output.stdout.split()
-device_elements = elements[7:]
 
-#Prepare dictionary 
-device_ip_dict = {}
+def list_devices(ttl=DEVICE_CACHE_TTL):
+    '''Return {index: [name, device type, ip]} for the devices reported by mokucli list'''
 
-#Add names, hardware ids, and ip addresses to dict in order provided by mokucli list
-for k in range(len(device_elements)):
-    if k%6 == 0:
-        index = int(k/6 + 1)
+    #Reuse the cached device list if it is recent enough
+    try:
+        if time.time() - os.path.getmtime(DEVICE_CACHE) < ttl:
+            with open(DEVICE_CACHE, 'r') as file:
+                return json.load(file)
+    except (OSError, ValueError):
+        pass
 
-        ip = device_elements[k+4]
+    #Run mokucli list in command line and store output
+    output = subprocess.run(['mokucli', 'list'], capture_output=True, text=True, check=False)
 
-        #Remove portion after and including % symbol at the end of IP address
-        pos = ip.find('%')
-        if pos != -1:
-            ip = ip[:pos]
+    #Split output into words and remove header and formatting
+    elements = output.stdout.split()
+    device_elements = elements[7:]
 
-        device_ip_dict[str(index)] = [device_elements[k], device_elements[k+2], ip]
+    #Add names, hardware ids, and ip addresses to dict in order provided by mokucli list.
+    #Each device is a row of 6 words; the portion of the IP address after and including
+    #the % symbol is removed
+    rows = zip(*[iter(device_elements)]*6)
+    device_ip_dict = {str(index): [row[0], row[2], row[4].split('%', 1)[0]]
+                      for index, row in enumerate(rows, 1)}
+
+    #Only cache a non-empty list so a newly connected device is picked up right away
+    if device_ip_dict:
+        try:
+            with open(DEVICE_CACHE, 'w') as file:
+                json.dump(device_ip_dict, file)
+        except OSError:
+            pass
+
+    return device_ip_dict
+
+
+device_ip_dict = list_devices()
 
 #Proceed only if dictionary is not empty i.e. at least one device is found
 if bool(device_ip_dict):
@@ -34,23 +56,18 @@ if bool(device_ip_dict):
     [print(f"{key}. {value[0]}: {value[2]} (Device Type: {value[1]})") for key, value in device_ip_dict.items()]
 
     #Ask user to select a device and store the corresponding IP address
-    check = True
-    if len(device_ip_dict.keys()) == 1:
-        check = False
+    if len(device_ip_dict) == 1:
         print('Only one device found.\n')
-        x = 1
-
-    while check: 
-        x = input('Please type in the number of the moku device you would like to connect to: ')
-        try: 
-            if int(x) <= len(device_elements)/5 and int(x) > 0:
-                check = False
-
-            else:
-                print('Invalid number, please pick an index from the list of devices. \n')
+        x = '1'
 
-        except Exception as e:
-            print(f"An error occurred: {e}")
+    else:
+        #Valid answers are exactly the keys of the device dict
+        valid = set(device_ip_dict)
+        while True: 
+            x = input('Please type in the number of the moku device you would like to connect to: ').strip()
+            if x in valid:
+                break
+            print('Invalid number, please pick an index from the list of devices. \n')
 
     
     #Store configuration to conf dict
@@ -66,8 +83,7 @@ if bool(device_ip_dict):
 
 
     #Save conf as yaml file
-    with open('moku_device_info.yaml','w') as file:
-        yaml.dump(moku_inf, file)
+    save_conf('moku_device_info.yaml', moku_inf)
     print('Configuration has been saved to moku_device_info.yaml\n')
 
 
@@ -0,0 +1,258 @@
+#Small local daemon that keeps Moku instrument connections open between script runs.
+#
+#Start it once with `python mokud.py`; sweep.py and pulse.py then talk to it over a
+#unix socket instead of connecting (and claiming ownership) on every run. Ownership is
+#only relinquished when the daemon exits or on `python mokud.py --release <ip>`.
+import os
+import sys
+import stat
+import json
+import socket
+import asyncio
+import getpass
+import argparse
+import tempfile
+
+#The socket lives in a directory only the user can enter: $XDG_RUNTIME_DIR where the system
+#provides one, otherwise a private directory under the temp dir
+SOCKET_DIR = os.environ.get('XDG_RUNTIME_DIR') or os.path.join(tempfile.gettempdir(), f'mokud-{getpass.getuser()}')
+SOCKET_PATH = os.path.join(SOCKET_DIR, 'mokud.sock')
+
+#Instrument methods clients may call; anything else is refused, so the daemon cannot be used
+#to run arbitrary attributes of the instrument objects
+ALLOWED_OPS = frozenset((
+    'generate_waveform', 'set_defaults', 'set_modulation', 'set_output_termination',
+    'set_sweep_mode', 'summary',
+))
+
+
+class MokuClient:
+    '''Proxy for an instrument held open by mokud; method calls are forwarded over the socket'''
+
+    def __init__(self, ip, instrument='WaveformGenerator', path=SOCKET_PATH, connect=True):
+        self.ip = ip
+        self.instrument = instrument
+        self.path = path
+        #Raises OSError if the daemon is not running (or, as on Windows, unix sockets are not
+        #available), so callers can fall back to a direct connection
+        if not hasattr(socket, 'AF_UNIX'):
+            raise OSError('mokud needs unix sockets, which this platform does not provide')
+        self._open()
+        if connect:
+            try:
+                self._call('connect')
+            except Exception:
+                self.close()
+                raise
+
+    def _open(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            self.sock.connect(self.path)
+        except Exception:
+            self.sock.close()
+            raise
+        self.file = self.sock.makefile('rwb')
+        #Set while a request is in flight, i.e. left set if the call was interrupted
+        self.pending = False
+
+    def _call(self, op, *args, **kwargs):
+        #A call interrupted by Ctrl + C leaves its reply (or half a request) on the socket, and
+        #the protocol cannot resync, so start a fresh connection before the next request, e.g.
+        #the set_defaults() in a script's finally block
+        if self.pending:
+            self.close()
+            self._open()
+        request = {'op': op, 'ip': self.ip, 'instrument': self.instrument,
+                   'args': args, 'kwargs': kwargs}
+        self.pending = True
+        self.file.write((json.dumps(request) + '\n').encode())
+        self.file.flush()
+        line = self.file.readline()
+        if not line:
+            raise ConnectionError('mokud closed the connection')
+        self.pending = False
+        reply = json.loads(line)
+        if not reply['ok']:
+            raise RuntimeError(reply['error'])
+        return reply['result']
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return lambda *args, **kwargs: self._call(name, *args, **kwargs)
+
+    def relinquish_ownership(self):
+        '''Leave the instrument claimed by the daemon and just close this client'''
+        self.close()
+
+    def release(self):
+        '''Ask the daemon to relinquish ownership of the instrument'''
+        self._call('release')
+        self.close()
+
+    def close(self):
+        self.file.close()
+        self.sock.close()
+
+
+#Instrument handles kept open between script runs, keyed by IP address
+instruments = {}
+#Serializes access to the handles; created in serve() once the event loop is running
+lock = None
+
+
+def open_instrument(ip, instrument):
+    '''Return the cached instrument for ip, connecting to it on first use'''
+    if ip not in instruments:
+        import moku.instruments
+        cls = getattr(moku.instruments, instrument)
+        print(f'Connecting to {instrument} at {ip}')
+        instruments[ip] = cls(ip, force_connect=True)
+    return instruments[ip]
+
+
+def release_instrument(ip):
+    inst = instruments.pop(ip, None)
+    if inst is not None:
+        print(f'Relinquishing ownership of {ip}')
+        inst.relinquish_ownership()
+
+
+def drop_instrument(ip):
+    '''Forget a cached handle that no longer works, e.g. after the Moku rebooted'''
+    inst = instruments.pop(ip, None)
+    if inst is not None:
+        print(f'Dropping stale connection to {ip}')
+        try:
+            inst.relinquish_ownership()
+        except Exception:
+            pass
+
+
+def dispatch(request, used):
+    '''Run one request against the cached instrument (called off the event loop)
+
+    used is the set of IPs the requesting client connection has already used.
+    '''
+    op = request['op']
+    ip = request['ip']
+    if op == 'release':
+        release_instrument(ip)
+        return None
+
+    if op != 'connect' and op not in ALLOWED_OPS:
+        raise PermissionError(f'{op} is not an allowed instrument method')
+
+    instrument = request.get('instrument', 'WaveformGenerator')
+    #A handle cached by an earlier client connection may have gone stale since, e.g. if the
+    #Moku rebooted between script runs
+    inherited = ip in instruments and ip not in used
+    inst = open_instrument(ip, instrument)
+    used.add(ip)
+    if op == 'connect':
+        return None
+    args, kwargs = request.get('args', []), request.get('kwargs', {})
+    try:
+        return getattr(inst, op)(*args, **kwargs)
+    except OSError:
+        #Connection errors (requests' exceptions are OSErrors) on the first use of an inherited
+        #handle: reconnect once and retry, so a rebooted Moku does not need --release
+        if not inherited:
+            raise
+        drop_instrument(ip)
+        return getattr(open_instrument(ip, instrument), op)(*args, **kwargs)
+
+
+async def handle_client(reader, writer):
+    used = set()
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            try:
+                request = json.loads(line)
+                #The Moku API is blocking, so run it in a thread and serialize access to the handles
+                async with lock:
+                    result = await asyncio.to_thread(dispatch, request, used)
+                reply = {'ok': True, 'result': result}
+            except Exception as e:
+                reply = {'ok': False, 'error': f'{type(e).__name__}: {e}'}
+            writer.write((json.dumps(reply, default=str) + '\n').encode())
+            await writer.drain()
+    except ConnectionError:
+        #The client went away mid-call, e.g. it reconnected after Ctrl + C
+        pass
+    finally:
+        writer.close()
+
+
+def prepare_socket_dir(path):
+    '''Create the socket's directory if needed and refuse one other users could write to'''
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    st = os.stat(directory)
+    if st.st_uid != os.getuid() or st.st_mode & 0o022:
+        sys.exit(f'{directory} must be owned by you and not writable by others')
+
+    if os.path.lexists(path):
+        if not stat.S_ISSOCK(os.lstat(path).st_mode):
+            sys.exit(f'{path} exists and is not a socket')
+        #Do not take over the socket of a daemon that is still running
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(path)
+            sys.exit(f'mokud is already running on {path}')
+        except OSError:
+            #Stale socket left behind by a previous daemon
+            os.unlink(path)
+        finally:
+            probe.close()
+
+
+async def serve(path):
+    global lock
+    lock = asyncio.Lock()
+
+    #Create the socket readable and writable by the user only
+    umask = os.umask(0o177)
+    try:
+        server = await asyncio.start_unix_server(handle_client, path=path)
+    finally:
+        os.umask(umask)
+    os.chmod(path, 0o600)
+    print(f'mokud listening on {path}. Press Ctrl + C to stop.')
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Keep Moku instrument connections open between script runs')
+    parser.add_argument('--socket', default=SOCKET_PATH, help=f'Unix socket path (default: {SOCKET_PATH})')
+    parser.add_argument('--release', metavar='IP', help='Ask a running daemon to relinquish ownership of IP and exit')
+    args = parser.parse_args()
+
+    if args.release:
+        ip = args.release if args.release.startswith('[') else '[' + args.release + ']'
+        client = MokuClient(ip, path=args.socket, connect=False)
+        client.release()
+        print(f'Released {ip}')
+        return
+
+    #Before the try: exiting here must not unlink the socket of a daemon that is still running
+    prepare_socket_dir(args.socket)
+    try:
+        asyncio.run(serve(args.socket))
+    except KeyboardInterrupt:
+        print('mokud to be terminated at user\'s request.')
+    finally:
+        for ip in list(instruments):
+            release_instrument(ip)
+        if os.path.exists(args.socket):
+            os.unlink(args.socket)
+        sys.exit('mokud terminated.')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,10 +1,12 @@
-import numpy as np
 import math 
 import time
 import sys
-import yaml
+import os
+import itertools
 from moku.instruments import WaveformGenerator
 from datetime import datetime
+from config import load_conf, save_conf
+from mokud import MokuClient
 
 
 #Ask user to input IP address of Moku device
@@ -14,8 +16,12 @@ while ip_flag:
     #ip = '[fe80::cb04:35db:d5c2:f05d]'
     try: 
         # Connect to your Moku by its ip address ip
+        # Reuse the connection held by mokud if it is running, otherwise connect directly.
         # force_connect will overtake an existing connection
-        i = WaveformGenerator(ip, force_connect=True)
+        try:
+            i = MokuClient(ip)
+        except OSError:
+            i = WaveformGenerator(ip, force_connect=True)
         ip_flag = False
     except Exception as e:
         print("An error while trying to connect to the IP address you provided (",ip,f"): {e}")
@@ -29,6 +35,7 @@ freq = 1 #Repetition rate of pulse
 pulse_width = 0.1 #Pulse width
 edge_width = 1e-8 #Pulse edge with, I don't think this can be set to 0
 no_pulses = 10 #Number of pulses (negative for infinite sequence)
+verbose = False #Print instrument summaries before and after the pulses (each is a round trip to the Moku)
 
 
 #Read conf_pulse.yaml file for parameters, output signal duration and number of pulses,
@@ -37,28 +44,32 @@ check_sig = True
 while check_sig:
     try:
 
-        #Read configuration from yaml file
-        try: 
-            with open('conf_pulse.yaml', 'r') as file:
-                loaded_conf = yaml.safe_load(file)
-
-            print("\nData read from 'conf_pulse.yaml':")
-            [print(f"{key}: {value}") for key, value in loaded_conf.items()]
-            amp = loaded_conf['amplitude']
-            freq = loaded_conf['repetition rate']
-            pulse_width = loaded_conf['pulse width']
-            edge_width = loaded_conf['edge width']
-            no_pulses = loaded_conf['no_pulses']
-
-            amp = float(amp)
-            freq = float(freq)
-            pulse_width = float(pulse_width)
-            edge_width = float(edge_width)
-            no_pulses = int(no_pulses)
-
-        except Exception as e:
-            print(f"An error occurred in trying to load conf_pulse.yaml: {e}")
-            print('Using default parameters.')
+        #Read configuration from yaml file, going straight to the defaults if it is absent
+        if not os.path.isfile('conf_pulse.yaml'):
+            print("\nNo 'conf_pulse.yaml' found. Using default parameters.")
+
+        else:
+            try: 
+                loaded_conf = load_conf('conf_pulse.yaml')
+
+                print("\nData read from 'conf_pulse.yaml':")
+                [print(f"{key}: {value}") for key, value in loaded_conf.items()]
+                amp = loaded_conf['amplitude']
+                freq = loaded_conf['repetition rate']
+                pulse_width = loaded_conf['pulse width']
+                edge_width = loaded_conf['edge width']
+                no_pulses = loaded_conf['no_pulses']
+
+                amp = float(amp)
+                freq = float(freq)
+                pulse_width = float(pulse_width)
+                edge_width = float(edge_width)
+                no_pulses = int(no_pulses)
+                verbose = bool(loaded_conf.get('verbose', False))
+
+            except Exception as e:
+                print(f"An error occurred in trying to load conf_pulse.yaml: {e}")
+                print('Using default parameters.')
         
         max_time = no_pulses*(1/freq) #Calculate max_time
 
@@ -85,6 +96,7 @@ conf = {
     'pulse width': pulse_width,
     'edge width': edge_width,
     'no_pulses': no_pulses,
+    'verbose': verbose,
 }
 
 
@@ -93,8 +105,7 @@ conf = {
 file_name = datetime.now().strftime("%Y-%m-%d_%Hh%Mm%Ss") + "_conf_pulse.yaml"
 
 #Save conf as yaml file
-with open(file_name,'w') as file:
-    yaml.dump(conf, file)
+save_conf(file_name, conf)
 print('Configuration has been saved to ' + file_name + '\n')
 
 
@@ -111,28 +122,32 @@ try:
         i.generate_waveform(channel=channel_no, type='Pulse', amplitude=amp, 
                             pulse_width = pulse_width, edge_time = edge_width, frequency=freq, offset=amp/2)
     
-        print('Printing summary of initial state: \n')
-        print(i.summary())
+        if verbose:
+            print('Printing summary of initial state: \n')
+            print(i.summary())
 
-        pulse_index = np.sign(no_pulses)
-        while pulse_index <= abs(no_pulses):
+        #Precompute the number of pulses (infinite for a continuous sequence) and half the period
+        total = no_pulses if no_pulses > 0 else float('inf')
+        half_period = 0.5/freq
+
+        for pulse_index in itertools.count(1):
+            if pulse_index > total:
+                break
         
             if no_pulses >= 0:
                 print('Running... Press Ctrl + C to stop. Pulse ',pulse_index,' of ', no_pulses)
             
             else:
-                print('Pulse no.',abs(pulse_index),'. Running continuously until interrupted... Press Ctrl + C to stop.')
+                print('Pulse no.',pulse_index,'. Running continuously until interrupted... Press Ctrl + C to stop.')
 
-            time.sleep((1/freq)*0.5)
+            time.sleep(half_period)
             
-            if pulse_index == abs(no_pulses):
+            if pulse_index == total:
                 #print('Running... Press Ctrl + C to stop. Pulse ',pulse_index,' of ', no_pulses)
                 i.generate_waveform(channel=channel_no, type='Off')
                 
-            time.sleep((1/freq)*0.5) #The timing may eventually get thrown off for very
-                                        #long pulse signals 
-        
-            pulse_index += np.sign(no_pulses)
+            time.sleep(half_period) #The timing may eventually get thrown off for very
+                                    #long pulse signals 
 
         print(pulse_index-1, ' of ', no_pulses,' pulses produced. ', max_time,' s elasped. Terminating program.')
 
@@ -144,8 +159,9 @@ finally:
     i.generate_waveform(channel=channel_no, type='Off')
     #i.generate_waveform(channel=1, type='Off')
 
-    print('Printing endstate summary: \n')
-    print(i.summary())
+    if verbose:
+        print('Printing endstate summary: \n')
+        print(i.summary())
 
     i.relinquish_ownership()
     sys.exit("Program terminated.")
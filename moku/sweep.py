@@ -2,9 +2,11 @@ import numpy as np
 import math 
 import time
 import sys
-import yaml
+import os
 from moku.instruments import WaveformGenerator
 from datetime import datetime
+from config import load_conf, save_conf
+from mokud import MokuClient
 
 
 #Ask user to input IP address of Moku device
@@ -14,8 +16,12 @@ while ip_flag:
     #ip = '[fe80::fbd7:7058:4eee:6ead]'
     try: 
         # Connect to your Moku by its ip address ip
+        # Reuse the connection held by mokud if it is running, otherwise connect directly.
         # force_connect will overtake an existing connection
-        i = WaveformGenerator(ip, force_connect=True)
+        try:
+            i = MokuClient(ip)
+        except OSError:
+            i = WaveformGenerator(ip, force_connect=True)
         ip_flag = False
     except Exception as e:
         print("An error while trying to connect to the IP address you provided (",ip,f"): {e}")
@@ -31,6 +37,7 @@ T = 3 #duration of sweep
 amp_incr = 1.01 #Multiplicative amplitude increment
 no_pulses = 10 #Number of pulses (note: redundant as amp_incr and the other variables determine 
                 #the number of pulses)
+verbose = False #Print instrument summaries before and after the sweep (each is a round trip to the Moku)
 
 
 
@@ -40,26 +47,30 @@ check_sig = True
 while check_sig:
     try:
 
-        #Read configuration from yaml file
-        try: 
-            with open('conf_sweep.yaml', 'r') as file:
-                loaded_conf = yaml.safe_load(file)
-
-            print("\nData read from 'conf_sweep.yaml':")
-            [print(f"{key}: {value}") for key, value in loaded_conf.items()]
-            amp = loaded_conf['amp']
-            end_amp = loaded_conf['end amp']
-            start_freq = loaded_conf['base frequency']
-            stop_freq = loaded_conf['stop frequency']
-            T = loaded_conf['sweep duration']
-            amp_incr = loaded_conf['amplitude increment']
-            if amp_incr == 'None':
-                amp_incr = None
-            no_pulses = loaded_conf['no_pulses']
-
-        except Exception as e:
-            print(f"An error occurred in trying to load conf_sweep.yaml: {e}")
-            print('Using default parameters.')
+        #Read configuration from yaml file, going straight to the defaults if it is absent
+        if not os.path.isfile('conf_sweep.yaml'):
+            print("\nNo 'conf_sweep.yaml' found. Using default parameters.")
+
+        else:
+            try: 
+                loaded_conf = load_conf('conf_sweep.yaml')
+
+                print("\nData read from 'conf_sweep.yaml':")
+                [print(f"{key}: {value}") for key, value in loaded_conf.items()]
+                amp = loaded_conf['amp']
+                end_amp = loaded_conf['end amp']
+                start_freq = loaded_conf['base frequency']
+                stop_freq = loaded_conf['stop frequency']
+                T = loaded_conf['sweep duration']
+                amp_incr = loaded_conf['amplitude increment']
+                if amp_incr == 'None':
+                    amp_incr = None
+                no_pulses = loaded_conf['no_pulses']
+                verbose = bool(loaded_conf.get('verbose', False))
+
+            except Exception as e:
+                print(f"An error occurred in trying to load conf_sweep.yaml: {e}")
+                print('Using default parameters.')
         
         #Calculate time of signal and no_pulses if amp_incr is given
         if amp_incr != None:
@@ -93,6 +104,7 @@ conf = {
     'sweep duration' : T,
     'amplitude increment': amp_incr,
     'no_pulses': no_pulses,
+    'verbose': verbose,
 }
 
 
@@ -100,8 +112,7 @@ conf = {
 file_name = datetime.now().strftime("%Y-%m-%d_%Hh%Mm%Ss") + "_conf_sweep.yaml"
 
 #Save conf as yaml file
-with open(file_name,'w') as file:
-    yaml.dump(conf, file)
+save_conf(file_name, conf)
 print('Configuration has been saved to ' + file_name + '\n')
 
 
@@ -115,22 +126,24 @@ try:
 
     #i.set_sweep_mode(channel=1, source='Internal', stop_frequency=stop_freq, sweep_time=T, trigger_level=0)
 
-    time_elapsed = 0
-    c_amp = amp
-    while time_elapsed <= max_time - T:
+    #Amplitude of every pulse, computed up front rather than by repeated multiplication so
+    #rounding errors do not accumulate over the sweep
+    amps = amp*amp_incr**np.arange(no_pulses)
+    #Pulses are scheduled against a monotonic deadline, so the time spent in the instrument
+    #calls does not add up over the sweep
+    deadline = time.perf_counter()
+    for pulse_index, c_amp in enumerate(amps, 1):
 
         i.generate_waveform(channel=1, type='Sine', amplitude=c_amp, frequency=start_freq)
         i.set_sweep_mode(channel=1, source='Internal', stop_frequency=stop_freq, sweep_time=T, trigger_level=0)
 
-        if time_elapsed == 0:
+        if pulse_index == 1 and verbose:
             print('Printing summary of initial state: \n')
             print(i.summary())
 
-        pulse_index = int(round((no_pulses*(time_elapsed + T))/max_time))
         print('Running... Press Ctrl + C to stop. Pulse amplitude:', round(c_amp,3), ' V. Pulse ',pulse_index,' of ', no_pulses)
-        time.sleep(T)
-        time_elapsed += T
-        c_amp = c_amp*amp_incr
+        deadline += T
+        time.sleep(max(0.0, deadline - time.perf_counter()))
     
     print('More than ', max_time,'s elasped. Terminating program.')
     
@@ -142,8 +155,9 @@ finally:
     #A little laggy here, pulse continues for a little longer than desired before shutting off. 
     i.set_defaults()
 
-    print('Printing endstate summary: \n')
-    print(i.summary())
+    if verbose:
+        print('Printing endstate summary: \n')
+        print(i.summary())
 
     i.relinquish_ownership()
     sys.exit("Program terminated.")
@@ -2,39 +2,128 @@
 
 import sys
 import time
+import math
 import argparse
 import socket
 import json
 import logging
+import logging.handlers
+import queue
 import subprocess
 import os
+import atexit
+import asyncio
+import threading
 from datetime import datetime
+from collections import defaultdict
+from types import MappingProxyType
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
 
-# Set EPICS environment variables for proper connection
-# Don't specify port - let EPICS auto-discover using broadcast
-os.environ['EPICS_CA_ADDR_LIST'] = '127.0.0.1'  # Use IP instead of hostname
-os.environ['EPICS_CA_AUTO_ADDR_LIST'] = 'NO'
-os.environ['EPICS_CA_SERVER_PORT'] = '5064'  
-os.environ['EPICS_CA_MAX_ARRAY_BYTES'] = '16384'
-os.environ['EPICS_CA_CONN_TMO'] = '10.0'
-
-import epics
-from epics import PV, caput
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import lxml.html
+from lxml import etree
 import re
 
-# Set up logging
+# Set up logging; the size-capped log file is written by a listener thread so
+# logging from the scrape path only enqueues the record
+_log_queue = queue.Queue(-1)
+_file_handler = logging.handlers.RotatingFileHandler('leybold_turbolab.log', maxBytes=10*1024*1024, backupCount=3)
+_file_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+_log_listener = logging.handlers.QueueListener(_log_queue, _file_handler)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+# The queue handler only merges the arguments into the message; the file handler formats it
+_queue_handler = logging.handlers.QueueHandler(_log_queue)
+_queue_handler.setFormatter(logging.Formatter('%(message)s'))
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
     handlers=[
         logging.StreamHandler(),
-        logging.FileHandler('leybold_turbolab.log')
+        _queue_handler
     ]
 )
 logger = logging.getLogger('leybold_turbolab')
 
+# EPICS environment used when the caller has not configured one. Channel Access reads
+# these when its context is created on first use, not when epics is imported.
+DEFAULT_EPICS_ENV = {
+    'EPICS_CA_ADDR_LIST': '127.0.0.1',  # Use IP instead of hostname
+    'EPICS_CA_AUTO_ADDR_LIST': 'NO',
+    'EPICS_CA_SERVER_PORT': '5064',
+    'EPICS_CA_MAX_ARRAY_BYTES': '16384',
+    'EPICS_CA_CONN_TMO': '10.0',
+}
+
+# Compiled once; finds an element by ID in a page parsed with lxml
+_XP_BY_ID = etree.XPath("//*[@id=$id]")
+
+# Numeric patterns used when parsing scraped values, compiled once
+_NUM_RE = re.compile(r'(\d+\.?\d*)')
+_NUM_C_RE = re.compile(r'(\d+\.?\d*)\s*°C')
+# Mantissa and optional exponent of a pressure, matched in one pass over the value text
+# followed by the exponent text, e.g. "1.2 -3", "1.2 ⁻³", "1.2 × 10⁻³" or "1.2e-3"
+_PRESSURE_RE = re.compile(
+    r'(?P<mant>\d+\.?\d*)'
+    r'(?:[^\d⁰¹²³⁴⁵⁶⁷⁸⁹+\-⁻⁺]*?(?:10\s*\^?)?(?P<exp>[-+⁻⁺]?[\d⁰¹²³⁴⁵⁶⁷⁸⁹]+))?'
+)
+
+# Texts the web interface shows in value elements before its JavaScript has filled them in
+_PLACEHOLDER_TEXTS = frozenset(("", "--"))
+_ZERO_RE = re.compile(r'^[0.]+$')
+
+
+def _is_placeholder(text):
+    """Return True if a value element's text is a pre-JavaScript placeholder, including 0."""
+    text = (text or "").strip()
+    return text in _PLACEHOLDER_TEXTS or bool(_ZERO_RE.match(text))
+
+
+# Powers of ten for the exponent range the pressure gauges report, looked up instead of computed
+_POW10 = {i: 10.0 ** i for i in range(-24, 25)}
+
+
+def _pow10(exponent):
+    """Return 10 ** exponent, from the lookup table where possible."""
+    return _POW10.get(exponent) or 10.0 ** exponent
+
+
+# Global JavaScript objects that may hold the values, read with a single execute_script call
+_JS_VARIABLES = (
+    "window.gaugeData", "window.pumpData", "window.sensorData",
+    "window.pressureData", "window.statusData", "window.deviceData",
+    "window.globalData", "window.turbolabData", "window.systemData"
+)
+_READ_JS_VARS_JS = "return [" + ", ".join(_JS_VARIABLES) + "];"
+
+# (substrings that must all appear in the lower-cased key, destination field), first match wins
+_JS_DISPATCH = (
+    (("chamber",), "chamber_pressure"),
+    (("gauge1",), "chamber_pressure"),
+    (("foreline",), "foreline_pressure"),
+    (("gauge2",), "foreline_pressure"),
+    (("backing",), "foreline_pressure"),
+    (("bearing", "temp"), "turbo_pump_bearing_temp"),
+)
+
+# Maps Unicode superscript digits and signs to ASCII so exponents can be parsed with int()
+_SUPERSCRIPT_TRANS = str.maketrans('⁰¹²³⁴⁵⁶⁷⁸⁹⁻⁺', '0123456789-+')
+
+# Returns {id: text} for the element IDs passed as the first argument, in one WebDriver call
+_READ_IDS_JS = """
+    var out = {};
+    arguments[0].forEach(function (id) {
+        var el = document.getElementById(id);
+        out[id] = el ? (el.textContent || el.value || '') : null;
+    });
+    return out;
+"""
+
+# Returns the element texts (as _READ_IDS_JS) and the JavaScript data globals in one call
+_READ_SNAPSHOT_JS = _READ_IDS_JS.replace("return out;", "return {ids: out, js: [" + ", ".join(_JS_VARIABLES) + "]};")
+
 class LeyboldTurbolab:
     """
     Interface to Leybold Turbolab pumping station.
@@ -45,7 +134,7 @@ class LeyboldTurbolab:
     DEFAULT_PORT = 80
     
     # Register map for Leybold Turbolab (keeping this to maintain compatibility)
-    REGISTERS = {
+    REGISTERS = MappingProxyType({
         # Pump status registers
         "turbo_pump_speed": {"addr": 0x1000, "type": "float", "scale": 1.0, "unit": "rpm"},
         "turbo_pump_current": {"addr": 0x1002, "type": "float", "scale": 0.1, "unit": "A"},
@@ -74,26 +163,103 @@ class LeyboldTurbolab:
         # Operating hours
         "turbo_pump_hours": {"addr": 0x1400, "type": "uint32", "scale": 1.0, "unit": "h"},
         "backing_pump_hours": {"addr": 0x1402, "type": "uint32", "scale": 1.0, "unit": "h"},
-    }
+    })
+    
+    # Pages fetched over plain HTTP before falling back to Selenium, in order of preference
+    HTTP_PAGES = ('/0.hgz', '/')
+    # Further pages and AJAX endpoints that may carry the same value elements
+    FALLBACK_PATHS = ('/status', '/data', '/overview', '/index.htm', '/index.html')
+    AJAX_PATHS = ('/ajax/status', '/api/data', '/get_values.cgi')
+    
+    # Element IDs holding the values on the web interface
+    ELEMENT_IDS = ("20v", "72v", "72p", "73v", "73p")
+    # Elements that hold a reading (not an exponent) and so are never legitimately 0
+    VALUE_IDS = ("20v", "72v", "73v")
+    
+    # Values watched to decide whether the station is in steady state, and the relative
+    # change between scrapes below which a value counts as stable
+    ADAPTIVE_KEYS = ("turbo_pump_speed", "turbo_pump_bearing_temp", "chamber_pressure", "foreline_pressure")
+    ADAPTIVE_THRESHOLD = 0.01
+    
+    # Registers that also get a "<name>_text" PV with the decoded status
+    STATUS_KEYS = frozenset(k for k in REGISTERS if "status" in k)
     
     # Status codes for interpretation
-    STATUS_CODES = {
+    STATUS_CODES = MappingProxyType({
         0: "Off",
         1: "Starting",
         2: "Normal operation",
         3: "Stopping",
         4: "Fault",
         5: "Maintenance required"
-    }
+    })
+    
+    # Default values for keys that might be missing from a scrape
+    DEFAULT_VALUES = MappingProxyType({
+        "turbo_pump_speed": 0.0,
+        "turbo_pump_current": 0.0,
+        "turbo_pump_power": 0.0,
+        "turbo_pump_drive_temp": 25.0,  # Room temperature as default
+        "turbo_pump_bearing_temp": 25.0,  # Room temperature as default
+        "turbo_pump_status": 0,  # Off
+        "turbo_pump_status_text": STATUS_CODES[0],  # Off
+        "backing_pump_speed": 0.0,
+        "backing_pump_current": 0.0,
+        "backing_pump_power": 0.0,
+        "backing_pump_temp": 25.0,  # Room temperature as default
+        "backing_pump_status": 0,  # Off
+        "backing_pump_status_text": STATUS_CODES[0],  # Off
+        "inlet_pressure": 1000.0,  # Atmospheric pressure as default
+        "foreline_pressure": 1000.0,  # Atmospheric pressure as default
+        "chamber_pressure": 1000.0,  # Atmospheric pressure as default
+        "system_status": 0  # Off
+    })
     
-    def __init__(self, host, port=DEFAULT_PORT, timeout=5.0):
-        """Initialize connection to the Leybold Turbolab pumping station."""
+    def __init__(self, host, port=DEFAULT_PORT, timeout=5.0, epics_env=None):
+        """
+        Initialize connection to the Leybold Turbolab pumping station.
+        
+        Args:
+            host: IP address of the pumping station
+            port: Web interface port
+            timeout: HTTP read timeout in seconds
+            epics_env: EPICS environment variables to use on top of DEFAULT_EPICS_ENV;
+                variables already set in the process environment take precedence
+        """
+        # Set EPICS environment variables for proper connection, without overriding
+        # an environment configured by the caller
+        for key, value in {**DEFAULT_EPICS_ENV, **(epics_env or {})}.items():
+            os.environ.setdefault(key, str(value))
+        
         self.host = host
         self.port = port
         self.timeout = timeout
+        # (connect, read) timeout so an unreachable host fails fast and a stalled read is bounded
+        self.request_timeout = (min(3.05, timeout), timeout)
         self.session = None
+        # Headless browser kept alive between Selenium scrapes, started on first use
+        self._browser = None
         self.last_data = {}
         self.simulation_mode = False
+        # Start of the simulated pump-down, set on the first simulated scrape
+        self._sim_start = None
+        
+        # Scraped values are reused for this many seconds before the page is fetched again
+        self._cache_ttl = 1.0
+        self._last_fetch_ts = 0.0
+        
+        # Background scraping thread and the latest data it produced
+        self._scrape_thread = None
+        self._stop_event = threading.Event()
+        self._data_lock = threading.Lock()
+        self._latest_data = {}
+        self._latest_seq = 0
+        
+        # Adaptive polling: the interval doubles while readings are stable and halves on change
+        self._min_interval = 0.5
+        self._max_interval = 10.0
+        self._current_interval = self._min_interval
+        self._prev_values = {}
         
         # Try to connect, fall back to simulation if connection fails
         if not self.connect():
@@ -104,25 +270,30 @@ class LeyboldTurbolab:
         """Establish connection to the pumping station web interface."""
         try:
             self.session = requests.Session()
-            self.session.timeout = self.timeout
+            # Pool keep-alive connections so polls reuse TCP connections instead of reconnecting;
+            # retries are left to the polling loop
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=Retry(total=0))
+            self.session.mount('http://', adapter)
             # Add headers to mimic a browser
             self.session.headers.update({
                 'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
                 'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
                 'Accept-Language': 'en-US,en;q=0.5',
+                'Connection': 'keep-alive',
             })
             
             # Test the connection with a request to the root URL
             url = f"http://{self.host}"
             logger.info(f"Attempting to connect to {url}")
-            response = self.session.get(url, timeout=self.timeout)
+            response = self.session.get(url, timeout=self.request_timeout)
             response.raise_for_status()  # Raise an exception for HTTP errors
             
-            # Log response details for debugging
             logger.info(f"Connected to {url} - Status: {response.status_code}")
-            logger.info(f"Response headers: {response.headers}")
-            logger.info(f"Response content type: {response.headers.get('Content-Type', 'unknown')}")
-            logger.info(f"Response length: {len(response.text)} bytes")
+            # Log response details for debugging
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Response headers: {response.headers}")
+                logger.debug(f"Response content type: {response.headers.get('Content-Type', 'unknown')}")
+                logger.debug(f"Response length: {len(response.text)} bytes")
             
             return True
         except Exception as e:
@@ -134,8 +305,158 @@ class LeyboldTurbolab:
             self.session = None
             return False
     
+    def set_cache_ttl(self, ttl):
+        """
+        Set how long scraped values are reused before the web interface is polled again.
+        
+        Args:
+            ttl: Cache lifetime in seconds; 0 disables caching
+        """
+        self._cache_ttl = float(ttl)
+
+    def invalidate_cache(self):
+        """Force the next scrape_web_data call to poll the web interface."""
+        self._last_fetch_ts = 0.0
+
+    def start_background_scrape(self, interval, max_interval=None):
+        """
+        Scrape the web interface from a daemon thread so callers are never blocked
+        by slow HTTP requests or Selenium page loads.
+        
+        Args:
+            interval: Shortest time between scrapes in seconds
+            max_interval: Longest time between scrapes while readings are stable;
+                None keeps the interval fixed
+        """
+        if self._scrape_thread and self._scrape_thread.is_alive():
+            return
+        self.set_poll_interval(interval, max_interval if max_interval is not None else interval)
+        self._stop_event.clear()
+        self._scrape_thread = threading.Thread(target=self._scrape_loop,
+                                               name='leybold-scrape', daemon=True)
+        self._scrape_thread.start()
+
+    def set_poll_interval(self, min_interval, max_interval):
+        """
+        Set the range the adaptive polling interval moves in.
+        
+        Args:
+            min_interval: Interval used while readings are changing, in seconds
+            max_interval: Upper limit while readings are stable, in seconds
+        """
+        self._min_interval = float(min_interval)
+        self._max_interval = max(float(max_interval), self._min_interval)
+        self._current_interval = self._min_interval
+
+    def next_interval(self, data):
+        """
+        Work out how long to wait before the next scrape. The interval doubles
+        (up to the maximum) while the watched values are stable and halves (down
+        to the minimum) as soon as one of them changes.
+        
+        Args:
+            data: Dictionary of the most recently scraped data
+            
+        Returns:
+            float: Time to wait before the next scrape in seconds
+        """
+        changed = not self._prev_values
+        for key in self.ADAPTIVE_KEYS:
+            new = data.get(key)
+            old = self._prev_values.get(key)
+            if new is None or old is None:
+                continue
+            # Relative change, since the pressures span many decades
+            if abs(new - old) > self.ADAPTIVE_THRESHOLD * max(abs(old), 1e-12):
+                changed = True
+                break
+        self._prev_values = {key: data[key] for key in self.ADAPTIVE_KEYS if key in data}
+        
+        if changed:
+            self._current_interval = max(self._min_interval, self._current_interval / 2)
+        else:
+            self._current_interval = min(self._max_interval, self._current_interval * 2)
+        return self._current_interval
+
+    def is_scraping(self):
+        """Return True while the background scraping thread is running."""
+        return self._scrape_thread is not None and self._scrape_thread.is_alive()
+
+    def stop_background_scrape(self, timeout=None):
+        """
+        Stop the background scraping thread and wait for it to finish.
+        
+        Args:
+            timeout: Maximum time to wait in seconds, or None to wait for the current scrape
+        """
+        self._stop_event.set()
+        if self._scrape_thread:
+            self._scrape_thread.join(timeout)
+            self._scrape_thread = None
+
+    def get_latest_data(self):
+        """
+        Get the most recent data produced by the background scraping thread.
+        
+        Returns:
+            tuple: (data dict, sequence number that increases with every successful scrape)
+        """
+        with self._data_lock:
+            return self._latest_data, self._latest_seq
+
+    async def scrape_web_data_async(self):
+        """
+        Run scrape_web_data in a worker thread so an event loop is not blocked.
+        
+        Returns:
+            dict: Dictionary with parameter names as keys and their values
+        """
+        return await asyncio.to_thread(self.scrape_web_data)
+
+    def _scrape_loop(self):
+        """Scrape repeatedly until stop_background_scrape is called."""
+        while not self._stop_event.is_set():
+            start_time = time.monotonic()
+            try:
+                # The loop paces itself, so bypass the cache: its TTL is stamped when a fetch
+                # finishes and would swallow every other scrape at a 1 s interval. Any data
+                # returned is therefore a fresh reading
+                data = self.scrape_web_data(use_cache=False)
+            except (AttributeError, NameError):
+                # A bug, not a transient failure: stop the thread so the main loop exits
+                logger.exception("Background scrape failed with a programming error")
+                raise
+            except Exception as e:
+                logger.error(f"Error during background scrape: {e}")
+                data = {}
+            
+            if data:
+                with self._data_lock:
+                    self._latest_data = dict(data)
+                    self._latest_seq += 1
+                interval = self.next_interval(data)
+            else:
+                logger.warning("Failed to read data from the pumping station")
+                # Try to reconnect; the browser is kept, as Selenium errors already restart it
+                self.reset_session()
+                interval = self._min_interval
+            
+            # Calculate wait time to maintain the interval
+            elapsed = time.monotonic() - start_time
+            self._stop_event.wait(max(0.1, interval - elapsed))
+
+    def reset_session(self):
+        """Replace the HTTP session after a failed scrape, keeping the browser running."""
+        self.invalidate_cache()
+        if self.session:
+            self.session.close()
+            self.session = None
+        return self.connect()
+
     def disconnect(self):
-        """Close the connection."""
+        """Close the connection and quit the browser."""
+        self.invalidate_cache()
+        self._close_browser()
         if self.session:
             self.session.close()
             self.session = None
@@ -148,17 +469,19 @@ class LeyboldTurbolab:
         Returns:
             bool: True if login is successful, False otherwise.
         """
+        # Logging in can change what the pages show, so do not serve cached values afterwards
+        self.invalidate_cache()
         try:
             # Construct the login URL with credentials
             login_url = f"http://{self.host}/?login=useruser"
             logger.info(f"Attempting to log in at {login_url}")
 
             # Send the login request
-            response = self.session.get(login_url, timeout=self.timeout)
+            response = self.session.get(login_url, timeout=self.request_timeout)
             response.raise_for_status()
 
             # Log the response content for debugging
-            logger.debug(f"Login response content: {response.text[:500]}...")
+            logger.debug("Login response content: %.500s...", response.text)
 
             # Check if login was successful by inspecting the response
             if "logout" in response.text.lower():
@@ -172,165 +495,271 @@ class LeyboldTurbolab:
             logger.error(f"Error during login: {str(e)}")
             return False
 
-    def scrape_web_data(self):
+    def scrape_web_data(self, use_cache=True):
         """
         Scrape data from the pumping station's web interface.
         
+        Args:
+            use_cache: Return the last values if they are younger than the cache TTL
+            
         Returns:
             dict: Dictionary with parameter names as keys and their values
         """
         if self.simulation_mode:
             return self._generate_simulated_values()
+        
+        # Pressures and temperatures do not change on sub-second scales, so reuse recent values
+        if use_cache and self.last_data and time.monotonic() - self._last_fetch_ts < self._cache_ttl:
+            return self.last_data
             
         if not self.session:
             if not self.connect():
                 logger.error("Failed to connect to web interface for scraping")
                 return {}
 
-        # Try Selenium scraping first as it's the most reliable for JavaScript-heavy pages
+        # Strategies in order of preference: plain HTTP avoids starting a browser when the
+        # values are in the served HTML, Selenium executes the JavaScript that fills them in,
+        # and the remaining pages and AJAX endpoints are probed concurrently as a last resort
+        strategies = (
+            ("HTTP", self._scrape_http),
+            ("Selenium", self._try_selenium_scrape),
+            ("fallback paths", self._probe_fallback_paths),
+        )
+        
         data = {}
-        selenium_success = False
+        source = None
+        for name, strategy in strategies:
+            logger.debug("Attempting to scrape using %s", name)
+            if strategy(data):
+                source = name
+                # Stop as soon as we have enough data points
+                if len(data) >= 3:
+                    break
         
-        logger.info("Attempting to scrape using Selenium WebDriver first")
-        if self._try_selenium_scrape(data):
-            selenium_success = True
-            logger.info("Successfully extracted data using Selenium WebDriver")
-            
-            # If we got enough data points from Selenium, return the data
-            if len(data) >= 3:
-                # Determine system status based on available data
-                if "turbo_pump_speed" in data and data["turbo_pump_speed"] > 1000:
-                    data["turbo_pump_status"] = 2  # Normal operation
-                    data["turbo_pump_status_text"] = self.STATUS_CODES[2]
-                else:
-                    data["turbo_pump_status"] = 0  # Off
-                    data["turbo_pump_status_text"] = self.STATUS_CODES[0]
-                    
-                # Determine overall system status based on turbo pump status
-                data["system_status"] = data.get("turbo_pump_status", 0)
-                
-                # Fill in any missing values with defaults
-                self._fill_missing_values(data)
-                
-                logger.info(f"Successfully scraped data using Selenium: {len(data)} values")
-                self.last_data = data
-                return data
+        # If we got any data, process and return it
+        if data:
+            return self._finalize_data(data, source)
         else:
-            logger.info("Selenium scraping was not successful, falling back to other methods")
+            logger.error("Failed to extract any data using all available methods")
+            return {}
 
-        # First try direct access to the homeval container without login
-        direct_access_success = False
+    def _generate_simulated_values(self):
+        """
+        Generate readings for simulation mode: the station pumping down from
+        atmosphere while the turbo pump spins up, starting at the first call.
         
-        # Try accessing /0.hgz page directly first, which often contains the homeval container
-        #if self._scrape_hgz_page(data):
-        #    direct_access_success = True
-        #    logger.info("Successfully extracted data from /0.hgz page without login")
+        Returns:
+            dict: Dictionary with parameter names as keys and their values
+        """
+        if self._sim_start is None:
+            self._sim_start = time.monotonic()
+        t = time.monotonic() - self._sim_start
+        spin_up = 1.0 - math.exp(-t / 120.0)
+        data = {
+            "turbo_pump_speed": 60000.0 * spin_up,
+            "turbo_pump_bearing_temp": 25.0 + 15.0 * spin_up,
+            "chamber_pressure": 1000.0 * math.exp(-t / 5.0) + 1e-7,
+            "foreline_pressure": 1000.0 * math.exp(-t / 3.0) + 1e-2,
+        }
+        return self._finalize_data(data, "simulation")
+
+    def _finalize_data(self, data, source):
+        """
+        Derive status fields, fill in missing values and store the result as the last good data.
         
-        # If we couldn't get data from the /0.hgz page, try the main page
-        #if not direct_access_success and self._scrape_main_page(data):
-        #    direct_access_success = True
-        #    logger.info("Successfully extracted data from main page without login")
-            
-        # If direct access worked and we got enough data points, return the data
-        if direct_access_success and len(data) >= 3:
-            # Determine system status based on available data
-            if "turbo_pump_speed" in data and data["turbo_pump_speed"] > 1000:
-                data["turbo_pump_status"] = 2  # Normal operation
-                data["turbo_pump_status_text"] = self.STATUS_CODES[2]
-            else:
-                data["turbo_pump_status"] = 0  # Off
-                data["turbo_pump_status_text"] = self.STATUS_CODES[0]
-                
-            # Determine overall system status based on turbo pump status
-            data["system_status"] = data.get("turbo_pump_status", 0)
+        Args:
+            data: Dictionary of scraped data
+            source: Description of where the data came from, for logging
             
-            # Fill in any missing values with defaults
-            self._fill_missing_values(data)
+        Returns:
+            dict: The completed data dictionary
+        """
+        # Determine system status based on available data
+        if "turbo_pump_speed" in data and data["turbo_pump_speed"] > 1000:
+            data["turbo_pump_status"] = 2  # Normal operation
+            data["turbo_pump_status_text"] = self.STATUS_CODES[2]
+        else:
+            data["turbo_pump_status"] = 0  # Off
+            data["turbo_pump_status_text"] = self.STATUS_CODES[0]
             
-            logger.info(f"Successfully scraped data from web interface without login: {len(data)} values")
-            self.last_data = data
-            return data
+        # Determine overall system status based on turbo pump status
+        data["system_status"] = data.get("turbo_pump_status", 0)
         
-        # If direct access failed, try logging in
-        #logger.info("Direct access without login didn't provide enough data, attempting login...")
-        #if not self._login():
-        #    logger.warning("Failed to log in, but will continue with scraping attempts")
-
-        # Attempt to scrape the data viewing page first
-        #data = self._scrape_data_viewing_page()
-        success = len(data) > 0
-
-        # If data viewing page scraping fails, fall back to other methods
-        if not success:
-            # Try scraping the trend table
-            #data = self._scrape_trend_table()
-            success = len(data) > 0
+        # Fill in any missing values with defaults
+        self._fill_missing_values(data)
+        
+        logger.info(f"Successfully scraped data using {source}: {len(data)} values")
+        self.last_data = data
+        self._last_fetch_ts = time.monotonic()
+        return data
 
-            # If trend table scraping fails, try other methods
-            if not success:
-                # Try direct main page
-                #if self._scrape_main_page(data):
-                #    success = True
+    def _fetch_page(self, path):
+        """
+        Fetch a page from the web interface with the shared session.
+        
+        Args:
+            path: URL path to fetch
+            
+        Returns:
+            str: Response body, or None if the request failed
+        """
+        try:
+            response = self.session.get(f"http://{self.host}{path}", timeout=self.request_timeout)
+            response.raise_for_status()
+            return response.text
+        except Exception as e:
+            logger.debug("Failed to fetch %s: %s", path, e)
+            return None
 
-                # If first approach didn't yield enough data, try other paths
-                if not success or len(data) < 3:
-                    paths = ['/', '/status', '/data', '/overview', '/index.htm', '/index.html']
-                    for path in paths:
-                        if path == '/' and not success:  # Skip if we already tried the main page
-                            continue
-                        if self._scrape_page(path, data):
-                            success = True
-                            break
+    def _scrape_http(self, data):
+        """
+        Scrape the known value elements from the served HTML without a browser.
+        All pages in HTTP_PAGES are fetched concurrently and the first one whose
+        value elements are all populated is used. Pages still showing the
+        placeholders that JavaScript later replaces are left to Selenium.
+        
+        Args:
+            data: Dictionary to store extracted data
+            
+        Returns:
+            bool: True if any value was extracted, False otherwise
+        """
+        with ThreadPoolExecutor(max_workers=len(self.HTTP_PAGES)) as executor:
+            bodies = list(executor.map(self._fetch_page, self.HTTP_PAGES))
+        
+        for path, body in zip(self.HTTP_PAGES, bodies):
+            texts = self._page_texts(path, body) if body else None
+            if not texts:
+                continue
+            if any(_is_placeholder(texts[element_id]) for element_id in self.VALUE_IDS):
+                logger.debug("Values on %s are not populated without JavaScript", path)
+                continue
+            if self._parse_element_texts(texts, data):
+                logger.debug("Extracted %d values from %s over HTTP", len(data), path)
+                return True
+        return False
 
-                # If we still don't have data, try AJAX endpoints if they exist
-                if not success or len(data) < 3:
-                    ajax_paths = ['/ajax/status', '/api/data', '/get_values.cgi']
-                    for path in ajax_paths:
-                        if self._scrape_ajax(path, data):
-                            success = True
-                            break
+    def _page_texts(self, path, body):
+        """
+        Parse a fetched page and return the text of the known value elements.
+        
+        Args:
+            path: URL path the body was fetched from, for logging
+            body: Page content
+            
+        Returns:
+            dict: Element ID to text ("" if absent), or None if the page could not be parsed
+        """
+        try:
+            tree = lxml.html.fromstring(body)
+        except (etree.ParserError, ValueError) as e:
+            logger.debug("Failed to parse %s: %s", path, e)
+            return None
+        texts = {}
+        for element_id in self.ELEMENT_IDS:
+            elements = _XP_BY_ID(tree, id=element_id)
+            texts[element_id] = elements[0].text_content() if elements else ""
+        return texts
 
-                # If all direct approaches failed, try a broader extraction
-                if not success or len(data) < 3:
-                    if self._extract_all_numeric_data(data):
-                        success = True
+    def _parse_page(self, path, body, data):
+        """
+        Parse a fetched page and extract the known value elements from it.
+        
+        Args:
+            path: URL path the body was fetched from, for logging
+            body: Page content
+            data: Dictionary to store extracted data
+            
+        Returns:
+            bool: True if any value was extracted, False otherwise
+        """
+        texts = self._page_texts(path, body)
+        return bool(texts) and self._parse_element_texts(texts, data)
 
-                # If we still don't have data, try the alternative scrape method
-                if not success or len(data) < 3:
-                    alternative_data = self._alternative_scrape()
-                    if alternative_data:
-                        data.update(alternative_data)
-                        success = True
+    def _probe_page(self, path):
+        """
+        Fetch and parse a single page.
+        
+        Args:
+            path: URL path to fetch
+            
+        Returns:
+            dict: Values extracted from the page (empty if none)
+        """
+        local = {}
+        body = self._fetch_page(path)
+        if body:
+            self._parse_page(path, body, local)
+        return local
 
-                # Explore additional endpoints for trend table
-                if not success or len(data) < 3:
-                    additional_data = self._scrape_additional_endpoints()
-                    if additional_data:
-                        data.update(additional_data)
-                        success = True
+    def _probe_fallback_paths(self, data):
+        """
+        Fetch all fallback pages and AJAX endpoints concurrently and use the first
+        one that yields at least three values. The whole probe is capped at
+        self.timeout rather than one timeout per path.
+        
+        Args:
+            data: Dictionary to store extracted data
+            
+        Returns:
+            bool: True if a path yielded enough values, False otherwise
+        """
+        paths = self.FALLBACK_PATHS + self.AJAX_PATHS
+        executor = ThreadPoolExecutor(max_workers=len(paths))
+        futures = {executor.submit(self._probe_page, path): path for path in paths}
+        try:
+            for future in as_completed(futures, timeout=self.timeout):
+                local = future.result()
+                if len(local) >= 3:
+                    logger.info(f"Extracted {len(local)} values from {futures[future]}")
+                    data.update(local)
+                    return True
+        except FuturesTimeoutError:
+            logger.warning(f"Probing fallback paths timed out after {self.timeout} s")
+        finally:
+            # Don't wait for slow paths once we have an answer
+            executor.shutdown(wait=False, cancel_futures=True)
+        return False
 
-        # If we got any data, process and return it
-        if data:
-            # Determine system status based on available data
-            if "turbo_pump_speed" in data and data["turbo_pump_speed"] > 1000:
-                data["turbo_pump_status"] = 2  # Normal operation
-                data["turbo_pump_status_text"] = self.STATUS_CODES[2]
-            else:
-                data["turbo_pump_status"] = 0  # Off
-                data["turbo_pump_status_text"] = self.STATUS_CODES[0]
-                
-            # Determine overall system status based on turbo pump status
-            data["system_status"] = data.get("turbo_pump_status", 0)
+    def _parse_element_texts(self, texts, data):
+        """
+        Extract values from the text content of the known value elements.
+        
+        Args:
+            texts: Dictionary mapping element ID to its text content
+            data: Dictionary to store extracted data
             
-            # Fill in any missing values with defaults
-            self._fill_missing_values(data)
+        Returns:
+            bool: True if any value was extracted, False otherwise
+        """
+        success = False
+        
+        # Bearing temperature
+        text = (texts.get("20v") or "").strip()
+        matches = _NUM_RE.search(text)
+        if matches:
+            data["turbo_pump_bearing_temp"] = float(matches.group(1))
+            success = True
+        
+        # Chamber and foreline pressure, split into mantissa and exponent elements
+        for value_id, exponent_id, key in (("72v", "72p", "chamber_pressure"),
+                                           ("73v", "73p", "foreline_pressure")):
+            text = (texts.get(value_id) or "").strip()
+            # An unpopulated value element must not let the exponent's digits pass as the mantissa
+            if _is_placeholder(text):
+                continue
+            exp_text = (texts.get(exponent_id) or "").strip()
+            match = _PRESSURE_RE.search(f"{text} {exp_text}")
+            if not match or match.start("mant") >= len(text):
+                continue
+            value = float(match["mant"])
+            if match["exp"]:
+                value = value * _pow10(self._convert_superscript_to_int(match["exp"]))
             
-            logger.info(f"Successfully scraped data from web interface: {len(data)} values")
-            self.last_data = data
-            return data
-        else:
-            logger.error("Failed to extract any data using all available methods")
-            return self._generate_simulated_values()
+            data[key] = value
+            success = True
+        
+        return success
 
     def _try_selenium_scrape(self, data):
         """
@@ -346,35 +775,18 @@ class LeyboldTurbolab:
         try:
             # Check if selenium is installed
             try:
-                from selenium import webdriver
-                from selenium.webdriver.chrome.options import Options
                 from selenium.webdriver.common.by import By
                 from selenium.webdriver.support.ui import WebDriverWait
                 from selenium.webdriver.support import expected_conditions as EC
-                from selenium.webdriver.chrome.service import Service
                 from selenium.common.exceptions import TimeoutException, WebDriverException
             except ImportError:
                 logger.warning("Selenium not installed, cannot use browser automation")
                 logger.info("Install with: pip install selenium")
                 return False
                 
-            logger.info("Starting Selenium WebDriver for browser automation")
-            
-            # Configure Chrome options
-            chrome_options = Options()
-            chrome_options.add_argument("--headless")  # Run in background
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-dev-shm-usage")
-            chrome_options.add_argument("--disable-gpu")
-            chrome_options.add_argument("--window-size=1920,1080")  # Set larger window size
-            chrome_options.add_argument("--user-agent=Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/114.0.0.0 Safari/537.36")
-            
             try:
-                # Try to start the browser
-                browser = webdriver.Chrome(options=chrome_options)
-                
-                # Set timeout
-                browser.set_page_load_timeout(30)
+                # Reuse the running browser, starting it on first use
+                browser = self._ensure_browser()
                 
                 # Load the page
                 url = f"http://{self.host}"
@@ -394,10 +806,18 @@ class LeyboldTurbolab:
                 except TimeoutException:
                     logger.warning("Timed out waiting for body element, but continuing")
                 
-                # Additional wait to allow JavaScript to update values - IMPORTANT for non-zero values
-                import time
-                logger.info("Waiting 1 seconds for JavaScript to fully initialize values...")
-                time.sleep(1)
+                # Wait until JavaScript has filled in the values - IMPORTANT for non-zero values.
+                # This returns as soon as the bearing temperature is populated instead of
+                # always sleeping for the worst case
+                def values_populated(driver):
+                    elements = driver.find_elements(By.ID, "20v")
+                    return bool(elements) and not _is_placeholder(elements[0].get_attribute("textContent"))
+                
+                logger.info("Waiting for JavaScript to initialize values...")
+                try:
+                    WebDriverWait(browser, 6).until(values_populated)
+                except TimeoutException:
+                    logger.warning("Timed out waiting for values to be populated, but continuing")
                 
                 # Try to login if login form is present
                 try:
@@ -417,362 +837,216 @@ class LeyboldTurbolab:
                         # Click the login button
                         login_buttons[0].click()
                         
-                        # Wait after login
+                        # Wait for the login page to be replaced and the values to be filled in again
                         logger.info("Waiting after login...")
-                        time.sleep(5)
+                        try:
+                            WebDriverWait(browser, 5).until(EC.staleness_of(login_buttons[0]))
+                            WebDriverWait(browser, 6).until(values_populated)
+                        except TimeoutException:
+                            logger.warning("Timed out waiting after login, but continuing")
                 except Exception as login_err:
                     logger.warning(f"Login attempt failed: {login_err}")
                 
-                # Get the page source after JavaScript has executed
-                page_source = browser.page_source
-                
-                # Save for debugging
-                with open("/tmp/leybold_selenium_page.html", "w") as f:
-                    f.write(page_source)
-                
-                # Dump all element IDs and text to help with debugging
-                try:
-                    logger.info("Dumping key elements for debugging:")
-                    all_elements = browser.find_elements(By.XPATH, "//*[@id]")
-                    for element in all_elements[:20]:  # Limit to first 20 to avoid log flooding
-                        element_id = element.get_attribute('id')
-                        element_text = element.text.strip() if element.text else "[No text]"
-                        logger.info(f"Element ID: {element_id}, Text: {element_text}")
-                except Exception as dump_err:
-                    logger.warning(f"Error dumping elements: {dump_err}")
+                # Debug artifacts cost a page dump and extra WebDriver calls, so only on DEBUG
+                if logger.isEnabledFor(logging.DEBUG):
+                    # Save the page source after JavaScript has executed
+                    with open("/tmp/leybold_selenium_page.html", "w") as f:
+                        f.write(browser.page_source)
+                    
+                    # Dump all element IDs and text to help with debugging
+                    try:
+                        logger.debug("Dumping key elements for debugging:")
+                        all_elements = browser.find_elements(By.XPATH, "//*[@id]")
+                        for element in all_elements[:20]:  # Limit to first 20 to avoid log flooding
+                            element_id = element.get_attribute('id')
+                            element_text = element.text.strip() if element.text else "[No text]"
+                            logger.debug(f"Element ID: {element_id}, Text: {element_text}")
+                    except Exception as dump_err:
+                        logger.warning(f"Error dumping elements: {dump_err}")
                 
                 # Improved extraction with better selectors and error handling
                 success = False
                 
-                # Extract bearing temperature - expanded selectors
-                bearing_temp_elements = browser.find_elements(By.XPATH, 
-                    "//*[contains(text(), '°C') or contains(@id, 'bear') or contains(@id, 'temp') or contains(@class, 'bearing') or contains(@id, '20v')]")
-                
-                for element in bearing_temp_elements:
-                    try:
-                        # Try to get text first
-                        text = element.text.strip()
-                        # If no text, try to get value attribute
-                        if not text:
-                            text = element.get_attribute('value')
-                            if not text:
-                                text = element.get_attribute('textContent')
-                        
-                        if text and ('°C' in text or text.replace('.', '', 1).isdigit()):
-                            logger.info(f"Found bearing temperature element with text: {text}")
-                            # Extract numeric value
-                            import re
-                            # Try to find a number followed by °C
-                            matches = re.search(r'(\d+\.?\d*)\s*°C', text)
-                            # If that fails, try to find any number
-                            if not matches:
-                                matches = re.search(r'(\d+\.?\d*)', text)
-                            
-                            if matches:
-                                value = float(matches.group(1))
-                                logger.info(f"Extracted bearing temperature: {value} °C")
-                                data["turbo_pump_bearing_temp"] = value
-                                success = True
-                                break
-                    except Exception as e:
-                        logger.error(f"Error processing bearing temperature element: {e}")
-                
-                # Try checking IDs directly for known patterns - this is often more reliable
-                known_ids = [
-                    "20v",  # Bearing temperature
-                    "72v",  # Chamber pressure
-                    "73v",  # Foreline pressure
-                    "pwr",  # Power
-                    "rpm",  # Speed
-                    "curr"  # Current
-                ]
+                # Read the text of all known value elements in a single WebDriver round trip
+                # and parse them the same way as the plain HTTP path
+                try:
+                    texts = browser.execute_script(_READ_IDS_JS, list(self.ELEMENT_IDS))
+                    logger.info(f"Found value element texts: {texts}")
+                    if self._parse_element_texts(texts or {}, data):
+                        success = True
+                except Exception as id_err:
+                    logger.error(f"Error reading value elements: {id_err}")
                 
-                # Specifically look for the exponent elements
-                exponent_ids = {
-                    "72p": "72v",  # Chamber pressure exponent
-                    "73p": "73v",  # Foreline pressure exponent
-                }
+                # Extract bearing temperature
+                if "turbo_pump_bearing_temp" not in data:
+                    # Element 20v did not give it; search with expanded selectors
+                    bearing_temp_elements = browser.find_elements(By.XPATH, 
+                        "//*[contains(text(), '°C') or contains(@id, 'bear') or contains(@id, 'temp') or contains(@class, 'bearing') or contains(@id, '20v')]")
                 
-                for element_id in known_ids:
-                    try:
-                        elements = browser.find_elements(By.ID, element_id)
-                        if elements:
-                            text = elements[0].text.strip()
-                            if not text:
-                                text = elements[0].get_attribute('value')
+                    for element in bearing_temp_elements:
+                        try:
+                            # Try to get text first
+                            text = element.text.strip()
+                            # If no text, try to get value attribute
                             if not text:
-                                text = elements[0].get_attribute('textContent')
-                                
-                            logger.info(f"Found element with ID {element_id}: {text}")
+                                text = element.get_attribute('value')
+                                if not text:
+                                    text = element.get_attribute('textContent')
+                        
+                            if text and ('°C' in text or text.replace('.', '', 1).isdigit()):
+                                logger.info(f"Found bearing temperature element with text: {text}")
+                                # Extract numeric value
+                                # Try to find a number followed by °C
+                                matches = _NUM_C_RE.search(text)
+                                # If that fails, try to find any number
+                                if not matches:
+                                    matches = _NUM_RE.search(text)
                             
-                            # Process based on ID type
-                            if element_id == "20v" and text:
-                                # Bearing temperature
-                                import re
-                                matches = re.search(r'(\d+\.?\d*)', text)
                                 if matches:
                                     value = float(matches.group(1))
-                                    logger.info(f"Extracted bearing temperature from ID {element_id}: {value} °C")
+                                    logger.info(f"Extracted bearing temperature: {value} °C")
                                     data["turbo_pump_bearing_temp"] = value
                                     success = True
-                            
-                            elif element_id in ["72v", "73v"] and text:
-                                # Chamber or Foreline pressure - handle mantissa part
-                                # First attempt to extract just the mantissa
-                                import re
-                                mantissa_match = re.search(r'(\d+\.?\d*)', text)
-                                if mantissa_match:
-                                    mantissa = float(mantissa_match.group(1))
-                                    logger.info(f"Extracted mantissa from ID {element_id}: {mantissa}")
-                                    
-                                    # Now look for the corresponding exponent
-                                    exponent_id = None
-                                    if element_id == "72v":
-                                        exponent_id = "72p"  # Chamber pressure exponent
-                                    elif element_id == "73v":
-                                        exponent_id = "73p"  # Foreline pressure exponent
-                                    
-                                    if exponent_id:
-                                        exponent_elements = browser.find_elements(By.ID, exponent_id)
-                                        if exponent_elements:
-                                            exp_text = exponent_elements[0].text.strip()
-                                            if not exp_text:
-                                                exp_text = exponent_elements[0].get_attribute('value')
-                                            if not exp_text:
-                                                exp_text = exponent_elements[0].get_attribute('textContent')
-                                            
-                                            logger.info(f"Found exponent element with ID {exponent_id}: {exp_text}")
-                                            
-                                            # Try to extract exponent value
-                                            exp_match = re.search(r'[-+]?\d+', exp_text)
-                                            if exp_match:
-                                                exponent = int(exp_match.group(0))
-                                            else:
-                                                # Handle superscript characters
-                                                exponent = self._convert_superscript_to_int(exp_text)
-                                            
-                                            # Calculate the final value
-                                            value = mantissa * (10 ** exponent)
-                                            
-                                            logger.info(f"Calculated value for {element_id} with exponent {exponent}: {value}")
-                                            
-                                            if element_id == "72v":
-                                                data["chamber_pressure"] = value
-                                                logger.info(f"Extracted chamber pressure: {value} mbar")
-                                            elif element_id == "73v":
-                                                data["foreline_pressure"] = value
-                                                logger.info(f"Extracted foreline pressure: {value} mbar")
-                                            
-                                            success = True
-                                        else:
-                                            # If exponent not found, try legacy method
-                                            if "×" in text or "x" in text or "10" in text:
-                                                # Try to parse scientific notation all in one element
-                                                sci_match = re.search(r'(\d+\.?\d*)\s*[×x]\s*10([¹²³⁴⁵⁶⁷⁸⁹⁰-]|\d+)', text)
-                                                if sci_match:
-                                                    base = float(sci_match.group(1))
-                                                    exp_part = sci_match.group(2)
-                                                    exp = self._convert_superscript_to_int(exp_part)
-                                                    value = base * (10 ** exp)
-                                                    
-                                                    if element_id == "72v":
-                                                        data["chamber_pressure"] = value
-                                                        logger.info(f"Extracted chamber pressure using legacy method: {value} mbar")
-                                                    elif element_id == "73v":
-                                                        data["foreline_pressure"] = value
-                                                        logger.info(f"Extracted foreline pressure using legacy method: {value} mbar")
-                                                    
-                                                    success = True
-                                            else:
-                                                # If no indication of scientific notation, use the value as is
-                                                if element_id == "72v":
-                                                    data["chamber_pressure"] = mantissa
-                                                    logger.info(f"Using mantissa as chamber pressure: {mantissa} mbar")
-                                                elif element_id == "73v":
-                                                    data["foreline_pressure"] = mantissa
-                                                    logger.info(f"Using mantissa as foreline pressure: {mantissa} mbar")
-                                                success = True
-                    except Exception as id_err:
-                        logger.error(f"Error processing element with ID {element_id}: {id_err}")
+                                    break
+                        except Exception as e:
+                            logger.error(f"Error processing bearing temperature element: {e}")
                 
-                # Try directly accessing the exponent elements
-                for exp_id, value_id in exponent_ids.items():
+                # Try accessing the /0.hgz page which often has more direct values, unless the
+                # main page already gave us enough
+                js_results = None
+                if len(data) < 3:
                     try:
-                        # Check if we already have the corresponding value
-                        if (value_id == "72v" and "chamber_pressure" in data) or (value_id == "73v" and "foreline_pressure" in data):
-                            continue
+                        logger.info("Trying to access /0.hgz page via Selenium")
+                        browser.get(f"http://{self.host}/0.hgz")
+                        # Return as soon as the pressure element is present instead of always sleeping
+                        try:
+                            WebDriverWait(browser, 2).until(
+                                EC.presence_of_element_located((By.ID, "72v"))
+                            )
+                        except TimeoutException:
+                            logger.warning("Timed out waiting for /0.hgz values, but continuing")
                         
-                        # Otherwise, try to look up both parts directly
-                        value_elements = browser.find_elements(By.ID, value_id)
-                        exp_elements = browser.find_elements(By.ID, exp_id)
+                        # Save page source for debugging
+                        if logger.isEnabledFor(logging.DEBUG):
+                            with open("/tmp/leybold_selenium_hgz_page.html", "w") as f:
+                                f.write(browser.page_source)
                         
-                        if value_elements and exp_elements:
-                            value_text = value_elements[0].text.strip() or value_elements[0].get_attribute('textContent')
-                            exp_text = exp_elements[0].text.strip() or exp_elements[0].get_attribute('textContent')
-                            
-                            logger.info(f"Found mantissa with ID {value_id}: {value_text}")
-                            logger.info(f"Found exponent with ID {exp_id}: {exp_text}")
-                            
-                            if value_text and exp_text:
-                                import re
-                                mantissa_match = re.search(r'(\d+\.?\d*)', value_text)
-                                if mantissa_match:
-                                    mantissa = float(mantissa_match.group(1))
-                                    
-                                    # Parse exponent
-                                    exp_match = re.search(r'[-+]?\d+', exp_text)
-                                    if exp_match:
-                                        exponent = int(exp_match.group(0))
-                                    else:
-                                        exponent = self._convert_superscript_to_int(exp_text)
-                                    
-                                    # Calculate the full value
-                                    value = mantissa * (10 ** exponent)
-                                    
-                                    if value_id == "72v":
-                                        data["chamber_pressure"] = value
-                                        logger.info(f"Extracted chamber pressure from direct ID lookup: {value} mbar")
-                                    elif value_id == "73v":
-                                        data["foreline_pressure"] = value
-                                        logger.info(f"Extracted foreline pressure from direct ID lookup: {value} mbar")
-                                    
-                                    success = True
-                    except Exception as exp_err:
-                        logger.error(f"Error processing exponent with ID {exp_id}: {exp_err}")
-                
-                # Try accessing the /0.hgz page which often has more direct values
-                try:
-                    logger.info("Trying to access /0.hgz page via Selenium")
-                    browser.get(f"http://{self.host}/0.hgz")
-                    try:
-                        WebDriverWait(browser, 10).until(
-                            EC.presence_of_element_located((By.TAG_NAME, "body"))
-                        )
-                    except TimeoutException:
-                        logger.warning("Timed out waiting for body element, but continuing")
-
-                    time.sleep(1)  # Wait for page to load
-                    
-                    # Save page source for debugging
-                    with open("/tmp/leybold_selenium_hgz_page.html", "w") as f:
-                        f.write(browser.page_source)
-                    
-                    # Try to find elements again on this page, using same logic as above
-                    for element_id in ["20v", "72v", "73v"]:
+                        # Read the value elements and the JavaScript data globals in one call
                         try:
-                            elements = browser.find_elements(By.ID, element_id)
-                            if elements:
-                                text = elements[0].text.strip() or elements[0].get_attribute('textContent')
-                                logger.info(f"Found element with ID {element_id} on /0.hgz page: {text}")
-                                
-                                # Process the same way as above
-                                if element_id == "20v" and text:
-                                    import re
-                                    matches = re.search(r'(\d+\.?\d*)', text)
-                                    if matches:
-                                        value = float(matches.group(1))
-                                        data["turbo_pump_bearing_temp"] = value
-                                        success = True
-                                elif element_id in ["72v", "73v"] and text:
-                                    # Check for corresponding exponent element
-                                    exponent_id = f"{element_id[0:2]}p"
-                                    exponent_elements = browser.find_elements(By.ID, exponent_id)
-                                    
-                                    import re
-                                    mantissa_match = re.search(r'(\d+\.?\d*)', text)
-                                    if mantissa_match:
-                                        mantissa = float(mantissa_match.group(1))
-                                        
-                                        if exponent_elements:
-                                            exp_text = exponent_elements[0].text.strip() or exponent_elements[0].get_attribute('textContent')
-                                            logger.info(f"Found exponent element with ID {exponent_id} on /0.hgz page: {exp_text}")
-                                            
-                                            # Try to extract exponent value
-                                            exp_match = re.search(r'[-+]?\d+', exp_text)
-                                            if exp_match:
-                                                exponent = int(exp_match.group(0))
-                                            else:
-                                                exponent = self._convert_superscript_to_int(exp_text)
-                                            
-                                            # Calculate the final value
-                                            value = mantissa * (10 ** exponent)
-                                        else:
-                                            # Fall back to simple number extraction
-                                            value = mantissa
-                                        
-                                        if element_id == "72v":
-                                            data["chamber_pressure"] = value
-                                        elif element_id == "73v":
-                                            data["foreline_pressure"] = value
-                                        
-                                        success = True
+                            snapshot = browser.execute_script(_READ_SNAPSHOT_JS, list(self.ELEMENT_IDS)) or {}
+                            texts = snapshot.get("ids") or {}
+                            js_results = snapshot.get("js")
+                            logger.info(f"Found value element texts on /0.hgz page: {texts}")
+                            if self._parse_element_texts(texts, data):
+                                success = True
                         except Exception as hgz_err:
-                            logger.error(f"Error processing element with ID {element_id} on /0.hgz page: {hgz_err}")
-                except Exception as hgz_page_err:
-                    logger.error(f"Error accessing /0.hgz page via Selenium: {hgz_page_err}")
+                            logger.error(f"Error reading value elements on /0.hgz page: {hgz_err}")
+                    except Exception as hgz_page_err:
+                        logger.error(f"Error accessing /0.hgz page via Selenium: {hgz_page_err}")
                 
                 # Try to take a screenshot for debugging
-                try:
-                    logger.info("Taking screenshot of the page")
-                    browser.save_screenshot("/tmp/leybold_screenshot.png")
-                    logger.info("Screenshot saved to /tmp/leybold_screenshot.png")
-                except Exception as ss_err:
-                    logger.error(f"Error taking screenshot: {ss_err}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    try:
+                        browser.save_screenshot("/tmp/leybold_screenshot.png")
+                        logger.debug("Screenshot saved to /tmp/leybold_screenshot.png")
+                    except Exception as ss_err:
+                        logger.error(f"Error taking screenshot: {ss_err}")
                 
                 # Try to extract data from JavaScript variables
                 try:
                     logger.info("Trying to extract data from JavaScript variables")
-                    js_variables = [
-                        "window.gaugeData", "window.pumpData", "window.sensorData",
-                        "window.pressureData", "window.statusData", "window.deviceData",
-                        "window.globalData", "window.turbolabData", "window.systemData"
-                    ]
-                    
-                    for js_var in js_variables:
-                        try:
-                            result = browser.execute_script(f"return {js_var};")
-                            if result:
-                                logger.info(f"Found data in {js_var}: {result}")
-                                if isinstance(result, dict):
-                                    # Extract relevant values based on key names
-                                    for key, value in result.items():
-                                        key_lower = key.lower()
-                                        if isinstance(value, (int, float)) and value != 0:
-                                            if "chamber" in key_lower or "gauge1" in key_lower:
-                                                data["chamber_pressure"] = float(value)
-                                                logger.info(f"Extracted chamber pressure from JS: {value} mbar")
-                                                success = True
-                                            elif "foreline" in key_lower or "gauge2" in key_lower or "backing" in key_lower:
-                                                data["foreline_pressure"] = float(value)
-                                                logger.info(f"Extracted foreline pressure from JS: {value} mbar")
-                                                success = True
-                                            elif "bearing" in key_lower and "temp" in key_lower:
-                                                data["turbo_pump_bearing_temp"] = float(value)
-                                                logger.info(f"Extracted bearing temperature from JS: {value} °C")
-                                                success = True
-                        except Exception as js_err:
-                            logger.warning(f"Error accessing {js_var}: {js_err}")
+                    if js_results is None:
+                        js_results = browser.execute_script(_READ_JS_VARS_JS)
+                    if self._parse_js_globals(js_results or [], data):
+                        success = True
                 except Exception as js_ex:
                     logger.error(f"Error in JavaScript data extraction: {js_ex}")
                 
-                # Clean up
-                browser.quit()
-                
-                # Return True if we found data
+                # Return True if we found data; the browser is kept for the next poll
                 return success
                 
             except Exception as e:
                 logger.error(f"Error using Selenium: {str(e)}")
-                try:
-                    browser.quit()
-                except:
-                    pass
+                # Drop the browser so the next poll starts a fresh one
+                self._close_browser()
                 return False
                 
         except Exception as e:
             logger.error(f"Error initializing Selenium: {str(e)}")
             return False
 
+    def _parse_js_globals(self, results, data):
+        """
+        Extract values from the JavaScript data globals read from the page.
+        
+        Args:
+            results: Values of the variables in _JS_VARIABLES, in the same order
+            data: Dictionary to store extracted data
+            
+        Returns:
+            bool: True if any value was extracted, False otherwise
+        """
+        success = False
+        for js_var, result in zip(_JS_VARIABLES, results):
+            if not isinstance(result, dict):
+                continue
+            logger.info(f"Found data in {js_var}: {result}")
+            # Extract relevant values based on key names
+            for key, value in result.items():
+                if not isinstance(value, (int, float)) or value == 0:
+                    continue
+                key_lower = key.lower()
+                for needles, dest in _JS_DISPATCH:
+                    if all(needle in key_lower for needle in needles):
+                        data[dest] = float(value)
+                        logger.info(f"Extracted {dest} from JS: {value}")
+                        success = True
+                        break
+        return success
+
+    def _ensure_browser(self):
+        """
+        Return the headless Chrome instance, starting it if it is not running.
+        
+        Returns:
+            WebDriver: The shared browser instance
+        """
+        if self._browser is not None:
+            # Reuse the running browser unless its chromedriver has gone away
+            if self._browser.service.is_connectable():
+                return self._browser
+            logger.warning("Selenium WebDriver is no longer reachable, restarting it")
+            self._close_browser()
+        
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        
+        logger.info("Starting Selenium WebDriver for browser automation")
+        
+        # Configure Chrome options
+        chrome_options = Options()
+        chrome_options.add_argument("--headless")  # Run in background
+        chrome_options.add_argument("--no-sandbox")
+        chrome_options.add_argument("--disable-dev-shm-usage")
+        chrome_options.add_argument("--disable-gpu")
+        chrome_options.add_argument("--window-size=1920,1080")  # Set larger window size
+        chrome_options.add_argument("--user-agent=Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/114.0.0.0 Safari/537.36")
+        
+        self._browser = webdriver.Chrome(options=chrome_options)
+        
+        # Set timeout
+        self._browser.set_page_load_timeout(30)
+        return self._browser
+
+    def _close_browser(self):
+        """Quit the headless browser if it is running."""
+        if self._browser is not None:
+            try:
+                self._browser.quit()
+            except Exception as e:
+                logger.warning(f"Error closing browser: {e}")
+            self._browser = None
+
     def _convert_superscript_to_int(self, superscript_str):
         """
         Convert superscript characters to regular integers.
@@ -784,28 +1058,11 @@ class LeyboldTurbolab:
         Returns:
             int: Integer value of the superscript
         """
-        # Map of superscript characters to their integer values
-        superscript_map = {
-            '⁰': 0, '¹': 1, '²': 2, '³': 3, '⁴': 4,
-            '⁵': 5, '⁶': 6, '⁷': 7, '⁸': 8, '⁹': 9,
-            '-': -1  # Handle negative exponent (⁻)
-        }
-        
-        # If it's a regular digit string, convert directly
-        if superscript_str.lstrip('-').isdigit():
-            return int(superscript_str)
-        
-        # For superscript characters
-        result = 0
-        is_negative = False
-        
-        for char in superscript_str:
-            if char == '⁻':
-                is_negative = True
-            elif char in superscript_map:
-                result = result * 10 + superscript_map[char]
-        
-        return -result if is_negative else result
+        try:
+            return int(superscript_str.translate(_SUPERSCRIPT_TRANS).strip())
+        except ValueError:
+            logger.warning(f"Could not parse exponent '{superscript_str}', assuming 0")
+            return 0
 
     def _fill_missing_values(self, data):
         """
@@ -814,54 +1071,29 @@ class LeyboldTurbolab:
         Args:
             data: Dictionary of scraped data to be filled
         """
-        # Define default values for keys that might be missing
-        defaults = {
-            "turbo_pump_speed": 0.0,
-            "turbo_pump_current": 0.0,
-            "turbo_pump_power": 0.0,
-            "turbo_pump_drive_temp": 25.0,  # Room temperature as default
-            "turbo_pump_bearing_temp": 25.0,  # Room temperature as default
-            "turbo_pump_status": 0,  # Off
-            "turbo_pump_status_text": self.STATUS_CODES[0],  # Off
-            "backing_pump_speed": 0.0,
-            "backing_pump_current": 0.0,
-            "backing_pump_power": 0.0,
-            "backing_pump_temp": 25.0,  # Room temperature as default
-            "backing_pump_status": 0,  # Off
-            "backing_pump_status_text": self.STATUS_CODES[0],  # Off
-            "inlet_pressure": 1000.0,  # Atmospheric pressure as default
-            "foreline_pressure": 1000.0,  # Atmospheric pressure as default
-            "chamber_pressure": 1000.0,  # Atmospheric pressure as default
-            "system_status": 0  # Off
-        }
+        # Add status text based on status codes, before the defaults would fill in "Off"
+        if "turbo_pump_status" in data:
+            data.setdefault("turbo_pump_status_text", self.STATUS_CODES.get(data["turbo_pump_status"], "Unknown"))
+        if "backing_pump_status" in data:
+            data.setdefault("backing_pump_status_text", self.STATUS_CODES.get(data["backing_pump_status"], "Unknown"))
         
         # Use last known good values if available, otherwise use defaults
-        for key, default_value in defaults.items():
-            if key not in data:
-                if key in self.last_data and self.last_data[key] is not None:
-                    data[key] = self.last_data[key]
-                else:
-                    data[key] = default_value
-        
-        # Add status text based on status codes
-        if "turbo_pump_status" in data and "turbo_pump_status_text" not in data:
-            status_code = data["turbo_pump_status"]
-            data["turbo_pump_status_text"] = self.STATUS_CODES.get(status_code, "Unknown")
+        last_data = self.last_data
+        for key, default_value in self.DEFAULT_VALUES.items():
+            value = last_data.get(key)
+            data.setdefault(key, default_value if value is None else value)
             
-        if "backing_pump_status" in data and "backing_pump_status_text" not in data:
-            status_code = data["backing_pump_status"]
-            data["backing_pump_status_text"] = self.STATUS_CODES.get(status_code, "Unknown")
-            
-        logger.debug(f"Filled missing values in data dictionary: {len(data)} total values")
+        logger.debug("Filled missing values in data dictionary: %d total values", len(data))
         return data
 
 def check_ioc_running():
     """Check if the EPICS IOC is running."""
     try:
         # Look for either auxioc or softIoc in the process list
-        result = subprocess.run(['pgrep', '-f', 'softIoc|auxioc'], 
-                                capture_output=True, text=True)
-        return len(result.stdout.strip()) > 0
+        # pgrep exits with 0 when at least one process matched
+        result = subprocess.run(['pgrep', '-f', 'softIoc|auxioc'],
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        return result.returncode == 0
     except Exception as e:
         logger.warning(f"Error checking for IOC process: {e}")
         # If we can't check, assume it's running
@@ -890,6 +1122,12 @@ def main():
         default=1.0,
         help='Update interval in seconds (default: 1.0)'
     )
+    parser.add_argument(
+        '--max-interval',
+        type=float,
+        default=10.0,
+        help='Longest scrape interval in seconds while readings are stable (default: 10.0)'
+    )
     parser.add_argument(
         '--prefix',
         default='Y1:AUX-',
@@ -930,40 +1168,48 @@ def main():
         for reg_name, reg_info in LeyboldTurbolab.REGISTERS.items():
             pv_name = f"{args.prefix}{reg_name.upper()}"
             pv_map[reg_name] = pv_name
-            logger.debug(f"Mapped register {reg_name} to PV {pv_name}")
+            logger.debug("Mapped register %s to PV %s", reg_name, pv_name)
             
         # Also map status text fields
-        for reg_name in LeyboldTurbolab.REGISTERS:
-            if "status" in reg_name:
-                text_field = f"{reg_name}_text"
-                pv_name = f"{args.prefix}{text_field.upper()}"
-                pv_map[text_field] = pv_name
-                logger.debug(f"Mapped register {text_field} to PV {pv_name}")
+        for reg_name in LeyboldTurbolab.STATUS_KEYS:
+            text_field = f"{reg_name}_text"
+            pv_name = f"{args.prefix}{text_field.upper()}"
+            pv_map[text_field] = pv_name
+            logger.debug("Mapped register %s to PV %s", text_field, pv_name)
+        pv_map = MappingProxyType(pv_map)
+        
+        # Scrape in a background thread so slow page loads never hold up the PV updates
+        leybold.start_background_scrape(args.interval, args.max_interval)
+        pv_updater = PVUpdater()
+        last_seq = 0
+        next_tick = time.monotonic()
         
         while True:
-            # Read all data from the pumping station using the scrape_web_data method
-            start_time = time.time()
-            data = leybold.scrape_web_data()
+            if not leybold.is_scraping():
+                raise RuntimeError("Background scrape thread stopped unexpectedly")
+            data, seq = leybold.get_latest_data()
             
-            if data:
+            # Only push data the scraper has not delivered before
+            if seq != last_seq:
+                last_seq = seq
                 # Update EPICS PVs with the data
-                update_epics_pvs(data, pv_map)
+                pv_updater.update(data, pv_map)
                 
                 # Optional: print summary of key values
                 if 'turbo_pump_speed' in data:
                     logger.info(f"Turbo pump speed: {data['turbo_pump_speed']} rpm")
                 if 'chamber_pressure' in data:
                     logger.info(f"Chamber pressure: {data['chamber_pressure']} mbar")
-            else:
-                logger.warning("Failed to read data from the pumping station")
-                # Try to reconnect
-                leybold.disconnect()
-                leybold.connect()
             
-            # Calculate wait time to maintain consistent interval
-            elapsed = time.time() - start_time
-            wait_time = max(0.1, args.interval - elapsed)
-            time.sleep(wait_time)
+            # Sleep until the next absolute deadline so the cadence does not drift and
+            # is unaffected by wall-clock jumps
+            next_tick += args.interval
+            sleep_for = next_tick - time.monotonic()
+            if sleep_for > 0:
+                time.sleep(sleep_for)
+            elif sleep_for < -args.interval:
+                # We fell behind by more than a whole interval; resync
+                next_tick = time.monotonic()
             
     except KeyboardInterrupt:
         logger.info("Received interrupt, shutting down...")
@@ -972,85 +1218,119 @@ def main():
         import traceback
         logger.critical(traceback.format_exc())
     finally:
+        leybold.stop_background_scrape()
         leybold.disconnect()
         logger.info("Program terminated")
 
 
-def update_epics_pvs(data, pv_map):
+class PVUpdater:
     """
-    Update EPICS PVs with data from the pumping station.
-    
-    Args:
-        data: Dictionary of parameter names and values
-        pv_map: Dictionary mapping parameter names to PV names
+    Pushes data from the pumping station to EPICS PVs, caching PV objects
+    and connection state between updates.
     """
-    # Create and cache PV objects to avoid constant reconnection
-    if not hasattr(update_epics_pvs, 'pv_objects'):
-        update_epics_pvs.pv_objects = {}
-        update_epics_pvs.connection_attempts = {}
     
-    updated_count = 0
-    connection_retry_limit = 5  # Retry connecting to a PV this many times before giving up
+    # Retry connecting to a PV this many times before giving up
+    CONNECTION_RETRY_LIMIT = 5
+    # Recreate all PV objects after this many updates in a row without a single successful put
+    MAX_CONSECUTIVE_FAILURES = 10
+    # Time allowed in total for the PVs created in an update to connect before their first put
+    NEW_PV_CONNECTION_TIMEOUT = 2.0
     
-    # If we haven't successfully updated any PVs in the last several calls,
-    # try to recreate all PV objects
-    if hasattr(update_epics_pvs, 'consecutive_failures'):
-        if update_epics_pvs.consecutive_failures > 10:
-            logger.warning("Too many consecutive failures, recreating all PV objects...")
-            update_epics_pvs.pv_objects = {}
-            update_epics_pvs.connection_attempts = {}
-            update_epics_pvs.consecutive_failures = 0
-    else:
-        update_epics_pvs.consecutive_failures = 0
+    def __init__(self):
+        """Initialize empty PV object and connection state caches."""
+        self.pv_objects = {}
+        self.connection_attempts = defaultdict(int)
+        self.consecutive_failures = 0
     
-    for param_name, value in data.items():
-        if param_name in pv_map:
+    def update(self, data, pv_map):
+        """
+        Update EPICS PVs with data from the pumping station.
+        
+        Args:
+            data: Dictionary of parameter names and values
+            pv_map: Dictionary mapping parameter names to PV names
+        """
+        updated_count = 0
+        
+        # If we haven't successfully updated any PVs in the last several calls,
+        # try to recreate all PV objects
+        if self.consecutive_failures > self.MAX_CONSECUTIVE_FAILURES:
+            logger.warning("Too many consecutive failures, recreating all PV objects...")
+            self.pv_objects = {}
+            self.connection_attempts = defaultdict(int)
+            self.consecutive_failures = 0
+        
+        pv_objects = self.pv_objects
+        connection_attempts = self.connection_attempts
+        
+        # Imported here so the scraper can be used without the EPICS client libraries
+        import epics
+        
+        # Only parameters that have a PV are pushed
+        param_names = data.keys() & pv_map.keys()
+        
+        # Create any missing PV objects first so their connection requests go out together
+        # instead of blocking on each one in turn
+        new_pvs = set()
+        for param_name in param_names:
+            pv_name = pv_map[param_name]
+            if pv_name not in pv_objects:
+                logger.info(f"Creating PV object for {pv_name}")
+                try:
+                    # Use auto_monitor=False for write-only PVs to reduce network traffic
+                    pv_objects[pv_name] = epics.PV(pv_name, connection_timeout=3.0, auto_monitor=False)
+                    new_pvs.add(pv_name)
+                except Exception as e:
+                    logger.error(f"Error creating PV {pv_name}: {str(e)}")
+        
+        # Give the new PVs one shared, short wait to connect, so the first reading (and the one
+        # after a recreate) is published instead of skipped
+        deadline = time.monotonic() + self.NEW_PV_CONNECTION_TIMEOUT
+        for pv_name in new_pvs:
+            pv_objects[pv_name].wait_for_connection(timeout=max(0.0, deadline - time.monotonic()))
+        
+        for param_name in param_names:
+            value = data[param_name]
             pv_name = pv_map[param_name]
-            
-            # Initialize connection attempt counter for this PV if it doesn't exist
-            if pv_name not in update_epics_pvs.connection_attempts:
-                update_epics_pvs.connection_attempts[pv_name] = 0
             
             # Skip PVs that have exceeded the retry limit
-            if update_epics_pvs.connection_attempts[pv_name] >= connection_retry_limit:
+            if connection_attempts[pv_name] >= self.CONNECTION_RETRY_LIMIT:
+                continue
+            
+            pv_obj = pv_objects.get(pv_name)
+            if pv_obj is None:
+                connection_attempts[pv_name] += 1
                 continue
             
-            # Create or get the PV object
             try:
-                if pv_name not in update_epics_pvs.pv_objects:
-                    logger.info(f"Creating PV object for {pv_name}")
-                    # Use auto_monitor=False for write-only PVs to reduce network traffic
-                    pv_obj = PV(pv_name, connection_timeout=3.0, auto_monitor=False)
-                    update_epics_pvs.pv_objects[pv_name] = pv_obj
-                else:
-                    pv_obj = update_epics_pvs.pv_objects[pv_name]
-                
-                # Check connection status and try to connect if needed
-                if not pv_obj.connected:
-                    logger.debug(f"Attempting to connect to {pv_name}")
-                    pv_obj.connect(timeout=2.0)
-                    update_epics_pvs.connection_attempts[pv_name] += 1
-                
-                # Try to update the PV if connected
+                # Channel Access connects in the background; an unconnected PV is
+                # retried on the next update rather than blocking this one
                 if pv_obj.connected:
-                    pv_obj.put(value, timeout=1.0, wait=False)  # Non-blocking put
+                    pv_obj.put(value, wait=False)  # Non-blocking put
                     updated_count += 1
-                    logger.debug(f"Updated PV {pv_name} = {value}")
+                    logger.debug("Updated PV %s = %s", pv_name, value)
                     # Reset the connection attempt counter on success
-                    update_epics_pvs.connection_attempts[pv_name] = 0
+                    connection_attempts[pv_name] = 0
+                elif pv_name in new_pvs:
+                    # Still connecting; not counted towards the retry limit
+                    logger.info(f"PV {pv_name} not connected yet")
                 else:
-                    logger.warning(f"PV {pv_name} not connected (attempt {update_epics_pvs.connection_attempts[pv_name]})")
+                    connection_attempts[pv_name] += 1
+                    logger.warning(f"PV {pv_name} not connected (attempt {connection_attempts[pv_name]})")
             except Exception as e:
                 logger.error(f"Error updating PV {pv_name}: {str(e)}")
-                update_epics_pvs.connection_attempts[pv_name] += 1
-    
-    logger.info(f"Updated {updated_count} of {len(data)} EPICS PVs")
-    
-    # Track consecutive failures to detect persistent connection issues
-    if updated_count == 0 and len(data) > 0:
-        update_epics_pvs.consecutive_failures += 1
-    else:
-        update_epics_pvs.consecutive_failures = 0
+                connection_attempts[pv_name] += 1
+        
+        # Send all queued puts in one go
+        epics.ca.flush_io()
+        
+        logger.info(f"Updated {updated_count} of {len(data)} EPICS PVs")
+        
+        # Track consecutive failures to detect persistent connection issues
+        if updated_count == 0 and len(data) > 0:
+            self.consecutive_failures += 1
+        else:
+            self.consecutive_failures = 0
 
 
 if __name__ == "__main__":
@@ -3,11 +3,17 @@
 import sys
 import os
 import time
+import functools
+import shutil
+import subprocess
 import cv2
 import numpy as np
 from datetime import datetime
-import traceback
 import threading
+import queue
+import logging
+import logging.handlers
+import atexit
 from PyQt5 import QtCore, QtGui, QtWidgets
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QPushButton, 
                             QVBoxLayout, QHBoxLayout, QLabel, QSlider, 
@@ -16,21 +22,195 @@ from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QPushButton,
 from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QImage, QPixmap
 
+# Set up logging; console and log file are written by a listener thread so logging
+# from the GUI and capture threads only enqueues the record
+_log_queue = queue.Queue(-1)
+_log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+_console_handler = logging.StreamHandler()
+_console_handler.setFormatter(_log_formatter)
+_file_handler = logging.handlers.RotatingFileHandler('thorcam.log', maxBytes=10*1024*1024, backupCount=3)
+_file_handler.setFormatter(_log_formatter)
+_log_listener = logging.handlers.QueueListener(_log_queue, _console_handler, _file_handler)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+# The queue handler only merges the arguments into the message; the listener's handlers format it
+_queue_handler = logging.handlers.QueueHandler(_log_queue)
+_queue_handler.setFormatter(logging.Formatter('%(message)s'))
+logging.basicConfig(level=logging.INFO, handlers=[_queue_handler])
+logger = logging.getLogger('thorcam')
+
 # Import Thorlabs SDK
 try:
     from thorlabs_tsi_sdk.tl_camera import TLCameraSDK, TLCamera
     from thorlabs_tsi_sdk.tl_camera_enums import SENSOR_TYPE
-    print("Successfully imported Thorlabs SDK modules")
+    logger.info("Successfully imported Thorlabs SDK modules")
 except ImportError as e:
-    print(f"Error: Thorlabs TSI SDK not found: {e}")
-    print("Please install it using:")
-    print("pip install thorlabs_tsi_sdk")
+    logger.error(f"Error: Thorlabs TSI SDK not found: {e}")
+    logger.info("Please install it using:")
+    logger.info("pip install thorlabs_tsi_sdk")
     sys.exit(1)
 except Exception as e:
-    print(f"Unexpected error importing Thorlabs SDK: {e}")
-    traceback.print_exc()
+    logger.exception(f"Unexpected error importing Thorlabs SDK: {e}")
     sys.exit(1)
 
+# PyAV is optional; without it recordings use OpenCV's VideoWriter
+try:
+    import av
+except ImportError:
+    av = None
+
+# cupy is optional; it provides page-locked host buffers, which upload to the GPU encoder
+# without the driver staging them through its own pinned memory first
+try:
+    from cupyx import empty_pinned
+except ImportError:
+    empty_pinned = None
+
+# PyAV H.264 encoders to try in order: NVIDIA, Intel, AMD, Apple, then software. Each has the
+# pixel format it is fed and its encoder options; nvenc does not support the zerolatency tune,
+# so it uses its own low-latency tune instead. The Intel, AMD and Apple encoders take NV12 from
+# system memory (h264_vaapi would need frames uploaded to the GPU, which PyAV cannot do for encoding).
+# Every entry sets its own rate target, matching FFMPEG_H264_ENCODERS: a bit rate for nvenc and
+# videotoolbox, a constant quality or QP for the others.
+AV_H264_ENCODERS = (
+    ('h264_nvenc', 'yuv420p', {'preset': 'p4', 'tune': 'll', 'rc': 'cbr', 'b': '20M'}),
+    ('h264_qsv', 'nv12', {'preset': 'veryfast', 'global_quality': '23', 'look_ahead': '0'}),
+    ('h264_amf', 'nv12', {'usage': 'lowlatency', 'rc': 'cqp', 'qp_i': '20', 'qp_p': '20'}),
+    ('h264_videotoolbox', 'nv12', {'realtime': '1', 'b': '20M'}),
+    ('libx264', 'yuv420p', {'preset': 'ultrafast', 'tune': 'zerolatency', 'crf': '20'}),
+)
+
+# The same preference for the ffmpeg executable: encoder, options placed before the input and
+# options placed after it. The ffmpeg CLI can upload frames for h264_vaapi itself.
+FFMPEG_H264_ENCODERS = (
+    ('h264_nvenc', [], ['-preset', 'p5', '-tune', 'll', '-rc', 'cbr', '-b:v', '20M', '-pix_fmt', 'yuv420p']),
+    ('h264_qsv', [], ['-global_quality', '23', '-look_ahead', '0', '-pix_fmt', 'nv12']),
+    ('h264_videotoolbox', [], ['-realtime', '1', '-b:v', '20M', '-pix_fmt', 'nv12']),
+    ('h264_vaapi', ['-vaapi_device', '/dev/dri/renderD128'], ['-vf', 'format=nv12,hwupload']),
+    ('libx264', [], ['-preset', 'ultrafast', '-tune', 'zerolatency', '-crf', '20', '-pix_fmt', 'yuv420p']),
+)
+
+# FourCCs for the OpenCV fallback writer, in order: H.264 where the backend has it, then
+# MPEG-4 Part 2, then MJPG, which has no inter-frame compression but opens almost everywhere
+CV2_FOURCCS = ('avc1', 'mp4v', 'MJPG')
+
+class AVVideoWriter:
+    """Writes 8-bit grayscale frames to an H.264 file through PyAV"""
+    def __init__(self, filename, codec_name, pix_fmt, fps, width, height, options):
+        # Raises if the encoder is not in this FFmpeg build
+        av.codec.Codec(codec_name, 'w')
+        self.container = av.open(filename, 'w')
+        try:
+            self.stream = self.container.add_stream(codec_name, rate=max(1, int(round(fps))))
+            self.stream.width = width
+            self.stream.height = height
+            self.stream.pix_fmt = pix_fmt
+            # add_stream defaults to 1 Mbit/s, far too little for full-sensor frames; clear it
+            # so only the rate control in options applies
+            self.stream.codec_context.bit_rate = 0
+            self.stream.options = options
+            # Open the encoder now, so a missing GPU shows up here rather than on the first frame
+            self.stream.codec_context.open()
+        except Exception:
+            self.container.close()
+            raise
+        
+        # For grayscale input the chroma of a 4:2:0 frame is constant, and 128 in every chroma
+        # byte is valid for both the planar (yuv420p) and interleaved (nv12) layouts. Fill it once
+        # and only copy the luma plane per frame, so PyAV does not convert every frame.
+        self.yuv_buf = None
+        if width % 2 == 0 and height % 2 == 0:
+            self.yuv_buf = np.full((height * 3 // 2, width), 128, dtype=np.uint8)
+            self.luma = self.yuv_buf[:height]
+    
+    def write(self, image):
+        """Encode one grayscale frame"""
+        frame = None
+        if self.yuv_buf is not None and image.shape == self.luma.shape:
+            np.copyto(self.luma, image)
+            try:
+                frame = av.VideoFrame.from_ndarray(self.yuv_buf, format=self.stream.pix_fmt)
+            except ValueError:
+                # Older PyAV without from_ndarray support for this format
+                self.yuv_buf = None
+        if frame is None:
+            # PyAV converts the frame to the stream's pixel format
+            frame = av.VideoFrame.from_ndarray(image, format='gray')
+        for packet in self.stream.encode(frame):
+            self.container.mux(packet)
+    
+    def release(self):
+        """Flush the encoder and close the file"""
+        for packet in self.stream.encode():
+            self.container.mux(packet)
+        self.container.close()
+
+# Serializes the encoder probe, so it never runs twice at once
+_ffmpeg_probe_lock = threading.Lock()
+
+def ffmpeg_h264_encoder(wait=True):
+    """Return the first entry of FFMPEG_H264_ENCODERS that works with the installed ffmpeg
+    
+    Listed encoders are test-encoded on a single blank frame, since a hardware encoder can be
+    built in without a device to run on. The result is cached for the lifetime of the app;
+    without PyAV, ThorlabsCameraApp probes at startup from a background thread. With
+    wait=False (the GUI thread) this never probes or waits for a probe: until one has
+    finished, the libx264 entry is returned.
+    """
+    if not wait and _probe_ffmpeg_h264_encoder.cache_info().currsize == 0:
+        return FFMPEG_H264_ENCODERS[-1]
+    with _ffmpeg_probe_lock:
+        return _probe_ffmpeg_h264_encoder()
+
+@functools.lru_cache(maxsize=None)
+def _probe_ffmpeg_h264_encoder():
+    """Uncached, unserialized body of ffmpeg_h264_encoder"""
+    try:
+        listed = subprocess.run(['ffmpeg', '-hide_banner', '-encoders'], capture_output=True,
+                                text=True, timeout=10).stdout
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.info(f"Could not list ffmpeg encoders: {e}")
+        return FFMPEG_H264_ENCODERS[-1]
+    for encoder in FFMPEG_H264_ENCODERS:
+        codec_name, input_args, output_args = encoder
+        if f" {codec_name} " not in listed:
+            continue
+        try:
+            probe = subprocess.run(
+                ['ffmpeg', '-hide_banner', '-loglevel', 'error', *input_args,
+                 '-f', 'lavfi', '-i', 'color=black:s=256x256', '-frames:v', '1',
+                 '-c:v', codec_name, *output_args, '-f', 'null', '-'],
+                capture_output=True, timeout=10)
+        except subprocess.SubprocessError:
+            continue
+        if probe.returncode == 0:
+            return encoder
+        logger.info(f"ffmpeg encoder {codec_name} unavailable")
+    return FFMPEG_H264_ENCODERS[-1]
+
+class FFmpegPipeWriter:
+    """Writes 8-bit grayscale frames to an H.264 file by piping raw video into an ffmpeg process"""
+    def __init__(self, filename, fps, width, height):
+        self.shape = (height, width)
+        # Created from the GUI thread, so never wait for the encoder probe
+        self.codec_name, input_args, output_args = ffmpeg_h264_encoder(wait=False)
+        self.process = subprocess.Popen(
+            ['ffmpeg', '-y', '-loglevel', 'error', *input_args,
+             '-f', 'rawvideo', '-pix_fmt', 'gray', '-s', f'{width}x{height}', '-r', str(fps), '-i', 'pipe:',
+             '-c:v', self.codec_name, *output_args, filename],
+            stdin=subprocess.PIPE)
+    
+    def write(self, image):
+        """Send one frame; the buffers handed in are contiguous, so no bytes copy is made"""
+        if image.shape != self.shape:
+            raise ValueError(f"Frame size {image.shape} does not match the recording size {self.shape}")
+        self.process.stdin.write(image.data)
+    
+    def release(self):
+        """Close the pipe and wait for ffmpeg to finish the file"""
+        self.process.stdin.close()
+        self.process.wait()
+
 class CameraInstance:
     """Class to store state and controls for each camera"""
     def __init__(self, name="Camera"):
@@ -38,107 +218,133 @@ class CameraInstance:
         self.camera_id = ""
         self.usb_port = ""
         self.name = name
+        # Default recording file name prefix, e.g. "camera_1"
+        self.filename_prefix = name.lower().replace(' ', '_')
+        # Model/serial/firmware text, read from the camera once when it is connected
+        self.info_str = ""
         self.recording = False
         self.video_writer = None
-        self.frame_count = 0
-        self.last_frame_time = time.time()
+        # frame_number and monotonic time at the last FPS label update
+        self.fps_frame_number = 0
+        self.last_frame_time = time.monotonic()
         self.fps = 30
+        # Whether the camera paces continuous acquisition itself (frame rate control supported)
+        self.hw_frame_rate = False
         self.exposure_ms = 10.0
         self.record_duration_limit = 0
         self.record_frame_limit = 0
         self.recorded_frame_count = 0
         self.recording_start_time = 0
-        self.last_frame = None
+        # Monotonic time of the last recording label update, which is throttled to a few Hz
+        self.last_label_update = 0.0
         # Add locks for thread safety
         self.camera_lock = threading.Lock()
+        # Background acquisition: the capture thread fills the two preallocated frame
+        # buffers in turn and the GUI reads the one at write_idx
+        self.capture_thread = None
+        self.stop_event = threading.Event()
+        self.frame_lock = threading.Lock()
+        self.frame_slot = [None, None]
+        self.write_idx = 0
+        self.frame_number = 0
+        # Stretch the intensity range of high bit depth frames instead of a fixed shift to 8 bits
+        self.auto_contrast = False
+        # Display: the latest frame is resized into display_buf, sized to the image label, and
+        # expanded into display_bgrx, which display_qimage wraps as RGB32 (Qt's native format
+        # for painting), so Qt neither converts nor paints more than a label-sized image
+        self.display_buf = None
+        self.display_bgrx = None
+        self.display_qimage = None
+        self.displayed_frame_number = 0
+        # (width, height) of the image label, updated on resize events rather than queried per frame
+        self.label_size = (800, 600)
+        # Recording: the capture thread queues frames and a writer thread owns the encoder,
+        # so acquisition never waits on compression
+        self.write_queue = queue.Queue(maxsize=16)
+        self.writer_thread = None
+        # Whether the stop sentinel has been queued for the current writer thread
+        self.writer_stop_sent = False
+        self.dropped_frames = 0
+        # Free list of frame copies for the writer thread, returned to it once a frame is encoded
+        self.free_bufs = queue.Queue()
 
-class ThorlabsCameraApp(QMainWindow):
-    def __init__(self):
+class CameraDiscoveryThread(QtCore.QThread):
+    """Creates the SDK and lists the available cameras without blocking the GUI"""
+    # Emitted with (display text, (camera ID, USB port)) entries for the camera selector
+    cameras_discovered = QtCore.pyqtSignal(list)
+    # Emitted with an error dialog title and message, and a status bar message
+    discovery_failed = QtCore.pyqtSignal(str, str, str)
+    
+    def __init__(self, app):
         super().__init__()
-        self.sdk = None
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update_frames)
-        self.sdk_lock = threading.Lock()  # Add lock for SDK access
-        
-        # Create two camera instances
-        self.cameras = {
-            "cam1": CameraInstance("Camera 1"),
-            "cam2": CameraInstance("Camera 2")
-        }
-        
-        # Flag to track if we're currently refreshing cameras
-        self.refreshing_cameras = False
-        
-        self.init_ui()
-        # Delay SDK initialization to prevent segfaults during startup
-        QTimer.singleShot(500, self.init_sdk)
-        
-    def init_sdk(self):
-        """Initialize the SDK and discover available cameras"""
+        self.app = app
+    
+    def run(self):
+        """Dispose any previous SDK, create a new one and collect camera info (runs in the thread)"""
+        app = self.app
         # Make sure any previous SDK instance is disposed
-        with self.sdk_lock:
-            if self.sdk is not None:
+        with app.sdk_lock:
+            if app.sdk is not None:
                 try:
-                    print("Disposing of existing SDK instance")
-                    self.sdk.dispose()
-                    self.sdk = None
+                    logger.info("Disposing of existing SDK instance")
+                    app.sdk.dispose()
+                    app.sdk = None
                     # Small delay to ensure SDK is fully disposed
                     time.sleep(0.5)
                 except Exception as e:
-                    print(f"Error disposing SDK: {e}")
-                    traceback.print_exc()
+                    logger.error(f"Error disposing SDK: {e}", exc_info=app.debug_mode)
         
         try:
-            print("Initializing SDK...")
-            with self.sdk_lock:
-                self.sdk = TLCameraSDK()
-                print(f"SDK initialized: {self.sdk}")
+            logger.info("Initializing SDK...")
+            with app.sdk_lock:
+                app.sdk = TLCameraSDK()
+                logger.info(f"SDK initialized: {app.sdk}")
                 
                 # Add a small delay before discovering cameras to prevent race conditions
                 time.sleep(0.2)
                 
-                available_cameras = self.sdk.discover_available_cameras()
+                available_cameras = app.sdk.discover_available_cameras()
                 # Filter out invalid camera IDs to prevent segfaults
                 valid_cameras = []
                 for cam_id in available_cameras:
                     # Check if ID is valid for processing
-                    if self.is_valid_camera_id(cam_id):
+                    if app.is_valid_camera_id(cam_id):
                         valid_cameras.append(cam_id)
                     else:
-                        print(f"Skipping invalid camera ID: {repr(cam_id)}")
+                        logger.warning(f"Skipping invalid camera ID: {repr(cam_id)}")
                 
                 # Check if we have multiple cameras and display a warning
                 if len(valid_cameras) > 1:
-                    print("NOTICE: Multiple cameras detected. Some Thorlabs camera models may")
-                    print("not support simultaneous operation. If you encounter issues, try")
-                    print("disconnecting one camera before connecting another.")
+                    logger.warning("NOTICE: Multiple cameras detected. Some Thorlabs camera models may")
+                    logger.warning("not support simultaneous operation. If you encounter issues, try")
+                    logger.warning("disconnecting one camera before connecting another.")
                 
-                print(f"Valid cameras: {[repr(c) for c in valid_cameras]}")
+                logger.info(f"Valid cameras: {[repr(c) for c in valid_cameras]}")
                 
                 # Store camera count for later use
-                self.available_camera_count = len(valid_cameras)
+                app.available_camera_count = len(valid_cameras)
             
             if not valid_cameras:
-                print("No valid cameras found during discovery")
-                self.show_error("No cameras found!", "Make sure cameras are connected and powered on.")
-                self.statusBar().showMessage("No cameras found!")
+                logger.warning("No valid cameras found during discovery")
+                self.discovery_failed.emit("No cameras found!", "Make sure cameras are connected and powered on.",
+                                           "No cameras found!")
                 return
             
-            # Populate the camera selection dropdown
-            self.camera_selector.clear()
+            # Collect the camera selection entries; the GUI thread fills the dropdown
+            entries = []
             
             for cam_id in valid_cameras:
                 try:
                     # Safely handle camera info retrieval
-                    with self.sdk_lock:
+                    with app.sdk_lock:
                         # Open camera briefly to get info - use repr for safer printing
-                        print(f"Getting info for camera {repr(cam_id)}")
-                        temp_camera = self.sdk.open_camera(cam_id)
+                        logger.info(f"Getting info for camera {repr(cam_id)}")
+                        temp_camera = app.sdk.open_camera(cam_id)
                         
                         # Safely get camera name and port info, handle potential encoding issues
                         try:
                             camera_name = str(temp_camera.name)
-                            print(f"Camera name: {camera_name}")
+                            logger.info(f"Camera name: {camera_name}")
                         except (UnicodeDecodeError, AttributeError):
                             # Fallback: use part of ID as name
                             try:
@@ -148,90 +354,149 @@ class ThorlabsCameraApp(QMainWindow):
                                     camera_name = f"Camera {cam_id}"
                             except:
                                 camera_name = "Unknown Camera"
-                            print(f"Using fallback name: {camera_name}")
+                            logger.warning(f"Using fallback name: {camera_name}")
                             
-                        usb_port = self.get_camera_usb_port(temp_camera)
-                        print(f"USB port: {usb_port}")
+                        usb_port = app.get_camera_usb_port(temp_camera)
+                        logger.info(f"USB port: {usb_port}")
                         
                         display_text = f"{camera_name} ({usb_port})"
                         # Store camera ID with USB port info for later use
-                        self.camera_selector.addItem(display_text, (cam_id, usb_port))
+                        entries.append((display_text, (cam_id, usb_port)))
                         
                         temp_camera.dispose()
-                        print(f"Successfully added camera to selector: {display_text}")
+                        logger.info(f"Successfully got info for camera: {display_text}")
                         
                         # Add a small delay between camera operations
                         time.sleep(0.1)
                         
                 except Exception as e:
-                    print(f"Error getting info for camera {repr(cam_id)}: {e}")
-                    traceback.print_exc()
+                    logger.error(f"Error getting info for camera {repr(cam_id)}: {e}", exc_info=app.debug_mode)
                     # Still try to add the camera with minimal information
                     try:
                         id_part = str(cam_id)[-6:] if isinstance(cam_id, str) and len(str(cam_id)) >= 6 else "unknown"
-                        self.camera_selector.addItem(f"Camera {id_part}", (cam_id, "Unknown"))
+                        entries.append((f"Camera {id_part}", (cam_id, "Unknown")))
                     except Exception as e2:
-                        print(f"Failed to add camera to selector: {e2}")
+                        logger.error(f"Failed to add camera to selector: {e2}")
             
-            msg = f"Found {len(valid_cameras)} valid camera(s)"
-            print(msg)
-            self.statusBar().showMessage(msg)
+            logger.info(f"Found {len(valid_cameras)} valid camera(s)")
+            self.cameras_discovered.emit(entries)
             
         except Exception as e:
-            print(f"SDK Initialization Error: {e}")
-            traceback.print_exc()
-            self.show_error("SDK Initialization Error", str(e))
-            self.statusBar().showMessage(f"Error initializing SDK: {str(e)}")
+            logger.error(f"SDK Initialization Error: {e}", exc_info=app.debug_mode)
+            self.discovery_failed.emit("SDK Initialization Error", str(e), f"Error initializing SDK: {str(e)}")
+
+class ThorlabsCameraApp(QMainWindow):
+    # Emitted from a capture thread when acquiring a frame failed
+    capture_error = QtCore.pyqtSignal(str, str)
+    # Emitted from a writer thread when encoding a frame failed, so the GUI stops the recording
+    writer_error = QtCore.pyqtSignal(str, str)
+    
+    def __init__(self):
+        super().__init__()
+        self.sdk = None
+        # Frames are acquired in per-camera threads; the timer only refreshes the FPS display
+        self.timer = QTimer()
+        self.timer.timeout.connect(self.update_fps_labels)
+        # Repaint at most at display rate, however fast the cameras deliver frames
+        self.display_timer = QTimer()
+        self.display_timer.timeout.connect(self.refresh_displays)
+        self.capture_error.connect(self.show_capture_error)
+        self.writer_error.connect(self.recording_failed)
+        # Serializes SDK-wide calls (create/dispose, discovery, open_camera). Frame acquisition and
+        # property access on an armed camera only take that camera's camera_lock, so the capture
+        # threads never contend on this lock.
+        self.sdk_lock = threading.Lock()
+        
+        # Create two camera instances
+        self.cameras = {
+            "cam1": CameraInstance("Camera 1"),
+            "cam2": CameraInstance("Camera 2")
+        }
+        
+        # Flag to track if we're currently refreshing cameras
+        self.refreshing_cameras = False
+        self.discovery_thread = None
+        # Mirrors the debug checkbox so capture threads can read it without touching widgets
+        self.debug_mode = False
+        
+        self.init_ui()
+        # Delay SDK initialization to prevent segfaults during startup
+        QTimer.singleShot(500, self.init_sdk)
+        # Without PyAV the ffmpeg pipe is the preferred writer: probe its encoders now, off the
+        # GUI thread, rather than when Record is pressed
+        if av is None and shutil.which('ffmpeg'):
+            threading.Thread(target=ffmpeg_h264_encoder, name="ffmpeg-probe", daemon=True).start()
+        
+    def init_sdk(self):
+        """Initialize the SDK and discover available cameras in a background thread"""
+        if self.discovery_thread and self.discovery_thread.isRunning():
+            logger.warning("Camera discovery already in progress")
+            return
+        self.statusBar().showMessage("Discovering cameras...")
+        self.discovery_thread = CameraDiscoveryThread(self)
+        self.discovery_thread.cameras_discovered.connect(self.populate_camera_selector)
+        self.discovery_thread.discovery_failed.connect(self.discovery_failed)
+        self.discovery_thread.finished.connect(self.discovery_finished)
+        self.discovery_thread.start()
+    
+    def populate_camera_selector(self, entries):
+        """Fill the camera selection dropdown with the discovered cameras"""
+        self.camera_selector.clear()
+        for display_text, camera_info in entries:
+            self.camera_selector.addItem(display_text, camera_info)
+        self.statusBar().showMessage(f"Found {len(entries)} valid camera(s)")
+    
+    def discovery_failed(self, title, message, status):
+        """Report a failed camera discovery"""
+        self.show_error(title, message)
+        self.statusBar().showMessage(status)
+    
+    def discovery_finished(self):
+        """Allow the camera list to be refreshed again"""
+        self.refreshing_cameras = False
+        self.refresh_btn.setEnabled(True)
     
     def is_valid_camera_id(self, camera_id):
         """Check if the camera ID is valid and safe to use"""
         try:
             # Check if camera_id is a string and can be safely printed
             if not isinstance(camera_id, str):
-                print(f"Non-string camera ID: {repr(camera_id)}")
-                return False
-                
-            # Check if the string contains only printable characters
-            if not all(c.isprintable() for c in camera_id):
-                print(f"Camera ID contains non-printable characters: {repr(camera_id)}")
+                logger.warning(f"Non-string camera ID: {repr(camera_id)}")
                 return False
                 
             # Check if the string is empty
             if not camera_id.strip():
-                print("Empty camera ID")
+                logger.warning("Empty camera ID")
                 return False
                 
-            # If it's a single control character, it's likely invalid
-            if len(camera_id) == 1 and ord(camera_id) < 32:
-                print(f"Camera ID is a control character: {repr(camera_id)}")
+            # Check if the string contains only printable characters (this also rejects
+            # control characters)
+            if not camera_id.isprintable():
+                logger.warning(f"Camera ID contains non-printable characters: {repr(camera_id)}")
                 return False
                 
             return True
         except Exception as e:
-            print(f"Error validating camera ID: {e}")
+            logger.error(f"Error validating camera ID: {e}")
             return False
             
     def get_camera_usb_port(self, camera):
         """Attempts to get USB port information for the camera"""
         try:
-            # Try several approaches to get meaningful camera identifier info
-            if hasattr(camera, "usb_port") and camera.usb_port:
-                return str(camera.usb_port)
-            elif hasattr(camera, "serial_number") and camera.serial_number:
-                return str(camera.serial_number)
-            elif hasattr(camera, "model") and camera.model:
-                return str(camera.model)
-            else:
-                # Create a unique identifier from the camera id
-                try:
-                    camera_id = str(camera.camera_id) if hasattr(camera, "camera_id") else "Unknown"
-                    # Make sure we only use printable characters
-                    camera_id = ''.join(c for c in camera_id if c.isprintable())
-                    return f"ID-{camera_id[-6:] if len(camera_id) >= 6 else camera_id}"
-                except:
-                    return "Unknown ID"
+            # Try several approaches to get meaningful camera identifier info; each property is
+            # an SDK call, so read it only once
+            for attr in ("usb_port", "serial_number", "model"):
+                value = getattr(camera, attr, None)
+                if value:
+                    return str(value)
+            
+            # Create a unique identifier from the camera id
+            camera_id = str(getattr(camera, "camera_id", "Unknown"))
+            # Make sure we only use printable characters
+            camera_id = ''.join(c for c in camera_id if c.isprintable())
+            return f"ID-{camera_id[-6:]}"
         except Exception as e:
-            print(f"Error getting camera USB port: {e}")
+            logger.error(f"Error getting camera USB port: {e}")
             return "Unknown port"
             
     def init_ui(self):
@@ -287,6 +552,8 @@ class ThorlabsCameraApp(QMainWindow):
             cam_instance.image_label.setAlignment(Qt.AlignCenter)
             cam_instance.image_label.setMinimumSize(800, 600)
             cam_instance.image_label.setText(f"Connect to {cam_instance.name} to view feed")
+            # Track the label size through eventFilter
+            cam_instance.image_label.installEventFilter(self)
             cam_layout.addWidget(cam_instance.image_label)
             
             # Controls for this camera
@@ -305,15 +572,25 @@ class ThorlabsCameraApp(QMainWindow):
             cam_instance.exposure_value.setRange(0.1, 1000.0)
             cam_instance.exposure_value.setValue(10.0)
             cam_instance.exposure_value.setSingleStep(1.0)
-            cam_instance.exposure_value.valueChanged.connect(lambda value, c=cam_id: self.set_exposure(c, value))
+            cam_instance.exposure_value.valueChanged.connect(functools.partial(self.set_exposure, cam_id))
             exposure_header.addWidget(cam_instance.exposure_value)
             
             cam_instance.exposure_slider = QSlider(Qt.Horizontal)
             cam_instance.exposure_slider.setRange(1, 10000)
             cam_instance.exposure_slider.setValue(100)
-            cam_instance.exposure_slider.valueChanged.connect(lambda value, c=cam_id: self.exposure_slider_changed(c, value))
+            cam_instance.exposure_slider.valueChanged.connect(functools.partial(self.exposure_slider_changed, cam_id))
             exposure_layout.addWidget(cam_instance.exposure_slider)
             
+            cam_instance.auto_contrast_checkbox = QCheckBox("Auto Contrast")
+            cam_instance.auto_contrast_checkbox.stateChanged.connect(
+                functools.partial(self.toggle_auto_contrast, cam_id))
+            exposure_layout.addWidget(cam_instance.auto_contrast_checkbox)
+            
+            # Push exposure changes to the camera only once the slider has settled for 50 ms
+            cam_instance.exposure_apply_timer = QTimer()
+            cam_instance.exposure_apply_timer.setSingleShot(True)
+            cam_instance.exposure_apply_timer.timeout.connect(functools.partial(self.apply_exposure, cam_id))
+            
             # --- Framerate Controls ---
             framerate_group = QGroupBox("Framerate Control")
             framerate_layout = QVBoxLayout()
@@ -326,15 +603,22 @@ class ThorlabsCameraApp(QMainWindow):
             cam_instance.framerate_value = QSpinBox()
             cam_instance.framerate_value.setRange(1, 100)
             cam_instance.framerate_value.setValue(30)
-            cam_instance.framerate_value.valueChanged.connect(lambda value, c=cam_id: self.set_framerate(c, value))
+            cam_instance.framerate_value.valueChanged.connect(functools.partial(self.set_framerate, cam_id))
             framerate_header.addWidget(cam_instance.framerate_value)
             
             cam_instance.framerate_slider = QSlider(Qt.Horizontal)
             cam_instance.framerate_slider.setRange(1, 100)
             cam_instance.framerate_slider.setValue(30)
-            cam_instance.framerate_slider.valueChanged.connect(lambda value, c=cam_id: self.framerate_slider_changed(c, value))
+            cam_instance.framerate_slider.valueChanged.connect(functools.partial(self.framerate_slider_changed, cam_id))
             framerate_layout.addWidget(cam_instance.framerate_slider)
             
+            cam_instance.framerate_apply_timer = QTimer()
+            cam_instance.framerate_apply_timer.setSingleShot(True)
+            cam_instance.framerate_apply_timer.timeout.connect(functools.partial(self.apply_framerate, cam_id))
+            # Polls a writer thread that is still flushing after recording was stopped
+            cam_instance.writer_flush_timer = QTimer()
+            cam_instance.writer_flush_timer.timeout.connect(functools.partial(self.poll_writer_flush, cam_id))
+            
             # Actual FPS display
             fps_layout = QHBoxLayout()
             fps_layout.addWidget(QLabel("Actual FPS:"))
@@ -371,6 +655,16 @@ class ThorlabsCameraApp(QMainWindow):
             frames_layout.addWidget(cam_instance.framecount_spinbox)
             recording_layout.addLayout(frames_layout)
             
+            # Frames buffered for the encoder before new ones are dropped: latency and RAM
+            # against tolerance of encoder or disk stalls
+            queue_layout = QHBoxLayout()
+            queue_layout.addWidget(QLabel("Write Queue (frames):"))
+            cam_instance.queue_spinbox = QSpinBox()
+            cam_instance.queue_spinbox.setRange(2, 1024)
+            cam_instance.queue_spinbox.setValue(16)
+            queue_layout.addWidget(cam_instance.queue_spinbox)
+            recording_layout.addLayout(queue_layout)
+            
             # Add control groups to main control layout
             controls_layout.addWidget(exposure_group)
             controls_layout.addWidget(framerate_group)
@@ -397,16 +691,21 @@ class ThorlabsCameraApp(QMainWindow):
         # Connect debug checkbox to update debug visibility
         self.debug_checkbox.stateChanged.connect(self.toggle_debug_mode)
     
+    def toggle_auto_contrast(self, cam_id, state):
+        """Switch a camera between auto-contrast and fixed 8-bit display scaling"""
+        self.cameras[cam_id].auto_contrast = state == Qt.Checked
+    
     def toggle_debug_mode(self, state):
         """Toggle visibility of debug information"""
         is_visible = state == Qt.Checked
+        self.debug_mode = is_visible
         for cam_id, cam_instance in self.cameras.items():
             cam_instance.debug_label.setVisible(is_visible)
             
     def refresh_camera_list(self):
         """Safely refresh the camera list"""
         if self.refreshing_cameras:
-            print("Camera refresh already in progress")
+            logger.warning("Camera refresh already in progress")
             return
             
         self.refreshing_cameras = True
@@ -423,11 +722,8 @@ class ThorlabsCameraApp(QMainWindow):
     
     def delayed_refresh(self):
         """Second part of refresh after cameras are disconnected"""
-        try:
-            self.init_sdk()
-        finally:
-            self.refreshing_cameras = False
-            self.refresh_btn.setEnabled(True)
+        # The refresh button is re-enabled when discovery finishes
+        self.init_sdk()
     
     def connect_camera(self, cam_id):
         """Connect to selected camera and assign to the specified camera slot"""
@@ -482,6 +778,7 @@ class ThorlabsCameraApp(QMainWindow):
         
         # Clean up existing camera if there is one
         if cam_instance.camera:
+            self.stop_capture(cam_id)
             try:
                 with cam_instance.camera_lock:
                     cam_instance.camera.disarm()
@@ -490,20 +787,14 @@ class ThorlabsCameraApp(QMainWindow):
                     time.sleep(0.2)
             except Exception as e:
                 error_msg = f"Error disconnecting from {cam_instance.name}: {str(e)}"
-                print(error_msg)
-                traceback.print_exc()
+                logger.error(error_msg, exc_info=self.debug_mode)
                 cam_instance.debug_label.setText(f"Error: {error_msg}")
                 self.show_error(f"Error disconnecting from {cam_instance.name}", str(e))
         
-        # Stop the timer temporarily while connecting to camera
-        timer_was_active = self.timer.isActive()
-        if timer_was_active:
-            self.timer.stop()
-            
         # Use a separate try-except block for each major step to provide better error reporting
         try:
             # Connect to the camera
-            print(f"Connecting to camera {device_id} for {cam_id}")
+            logger.info(f"Connecting to camera {device_id} for {cam_id}")
             self.statusBar().showMessage(f"Connecting to camera {device_id}...")
             
             with self.sdk_lock:
@@ -528,7 +819,7 @@ class ThorlabsCameraApp(QMainWindow):
                     except Exception as e:
                         last_error = e
                         retry_count += 1
-                        print(f"Connection attempt {retry_count} failed: {e}")
+                        logger.warning(f"Connection attempt {retry_count} failed: {e}")
                         time.sleep(1.0)  # Wait before retrying
                 
                 if retry_count == max_retries:
@@ -538,14 +829,14 @@ class ThorlabsCameraApp(QMainWindow):
             try:
                 # Configure camera with lock to ensure thread safety
                 with cam_instance.camera_lock:
-                    print(f"Configuring camera {device_id}")
+                    logger.info(f"Configuring camera {device_id}")
                     cam_instance.camera.frames_per_trigger_zero_for_unlimited = 0  # Continuous acquisition
                     cam_instance.camera.exposure_time_us = int(cam_instance.exposure_ms * 1000)  # Convert ms to μs
                     cam_instance.camera.image_poll_timeout_ms = 1000  # 1 second timeout
+                    cam_instance.hw_frame_rate = self._apply_frame_rate(cam_instance)
             except Exception as e:
                 error_msg = f"Error configuring camera: {str(e)}"
-                print(error_msg)
-                traceback.print_exc()
+                logger.error(error_msg, exc_info=self.debug_mode)
                 # Clean up the camera connection
                 with self.sdk_lock:
                     try:
@@ -560,15 +851,15 @@ class ThorlabsCameraApp(QMainWindow):
             try:
                 # Start the camera
                 with cam_instance.camera_lock:
-                    print(f"Arming camera {device_id}")
-                    cam_instance.camera.arm(2)  # 2 buffers for frame acquisition
+                    logger.info(f"Arming camera {device_id}")
+                    # 10 driver-side frame buffers, so a briefly stalled capture thread does not drop frames
+                    cam_instance.camera.arm(10)
                     time.sleep(0.2)  # Short delay after arming
-                    print(f"Triggering camera {device_id}")
+                    logger.info(f"Triggering camera {device_id}")
                     cam_instance.camera.issue_software_trigger()
             except Exception as e:
                 error_msg = f"Error arming camera: {str(e)}"
-                print(error_msg)
-                traceback.print_exc()
+                logger.error(error_msg, exc_info=self.debug_mode)
                 # Clean up the camera connection
                 with self.sdk_lock:
                     try:
@@ -591,37 +882,33 @@ class ThorlabsCameraApp(QMainWindow):
             
             cam_instance.status_label.setText(f"Connected to {cam_instance.name} ({usb_port})")
             
-            # Update debug info
+            # Update debug info; these properties do not change, so read them only once
             try:
-                camera_info = f"Model: {cam_instance.camera.model}, "
-                camera_info += f"SN: {cam_instance.camera.serial_number}, "
-                camera_info += f"Firmware: {cam_instance.camera.firmware_version}"
-                cam_instance.debug_label.setText(camera_info)
+                with cam_instance.camera_lock:
+                    cam_instance.info_str = (f"Model: {cam_instance.camera.model}, "
+                                             f"SN: {cam_instance.camera.serial_number}, "
+                                             f"Firmware: {cam_instance.camera.firmware_version}")
             except Exception as e:
-                cam_instance.debug_label.setText(f"Camera info error: {str(e)}")
+                cam_instance.info_str = f"Camera info error: {str(e)}"
+            cam_instance.debug_label.setText(cam_instance.info_str)
             
-            # Start the timer if it's not already running
-            interval = int(1000 / max(self.cameras["cam1"].fps if self.cameras["cam1"].camera else 1, 
-                                     self.cameras["cam2"].fps if self.cameras["cam2"].camera else 1))
-            print(f"Starting timer with interval {interval}ms")
-            self.timer.start(interval)
+            # Start acquiring frames in the background
+            self.start_capture(cam_id)
+            if not self.timer.isActive():
+                self.timer.start(1000)
+            if not self.display_timer.isActive():
+                self.display_timer.start(33)  # ~30 Hz
             
             msg = f"{cam_instance.name} connected successfully"
-            print(msg)
+            logger.info(msg)
             self.statusBar().showMessage(msg)
             
         except Exception as e:
             error_msg = f"Failed to connect to camera: {str(e)}"
-            print(f"Error connecting to {cam_instance.name}: {error_msg}")
-            traceback.print_exc()
+            logger.error(f"Error connecting to {cam_instance.name}: {error_msg}", exc_info=self.debug_mode)
             cam_instance.debug_label.setText(f"Connection error: {error_msg}")
             self.show_error(f"Error connecting to {cam_instance.name}", error_msg)
             self.statusBar().showMessage(f"Error connecting to {cam_instance.name}: {error_msg}")
-            
-            # Restore timer if it was active
-            if timer_was_active and not self.timer.isActive():
-                self.timer.start(int(1000 / max(self.cameras["cam1"].fps if self.cameras["cam1"].camera else 30, 
-                                              self.cameras["cam2"].fps if self.cameras["cam2"].camera else 30)))
                 
     def safe_camera_operation(self, func, *args, **kwargs):
         """Execute a function with proper locking to ensure thread safety"""
@@ -637,12 +924,14 @@ class ThorlabsCameraApp(QMainWindow):
         
         try:
             if cam_instance.camera:
-                print(f"Disconnecting camera {cam_id}")
+                logger.info(f"Disconnecting camera {cam_id}")
+                self.stop_capture(cam_id)
                 with cam_instance.camera_lock:
                     cam_instance.camera.disarm()
                     cam_instance.camera.dispose()
                 cam_instance.camera = None
                 cam_instance.camera_id = ""
+                cam_instance.info_str = ""
                 
                 # Update UI
                 if cam_id == "cam1":
@@ -660,120 +949,403 @@ class ThorlabsCameraApp(QMainWindow):
                 cam_instance.debug_label.setText("Debug info: Disconnected")
                 
                 msg = f"{cam_instance.name} disconnected"
-                print(msg)
+                logger.info(msg)
                 self.statusBar().showMessage(msg)
                 
                 # Stop the timer if no cameras are connected
                 if not self.cameras["cam1"].camera and not self.cameras["cam2"].camera:
-                    print("Stopping timer - no cameras connected")
+                    logger.info("Stopping timer - no cameras connected")
                     self.timer.stop()
+                    self.display_timer.stop()
                     
         except Exception as e:
             error_msg = f"Error disconnecting {cam_instance.name}: {str(e)}"
-            print(error_msg)
-            traceback.print_exc()
+            logger.error(error_msg, exc_info=self.debug_mode)
             cam_instance.debug_label.setText(f"Disconnect error: {error_msg}")
             self.show_error(f"Error disconnecting {cam_instance.name}", str(e))
     
-    def update_frames(self):
-        """Update frames from all connected cameras"""
-        for cam_id, cam_instance in self.cameras.items():
-            if cam_instance.camera:
-                self.update_camera_frame(cam_id)
+    def start_capture(self, cam_id):
+        """Start the background thread that acquires frames from a camera"""
+        cam_instance = self.cameras[cam_id]
+        if cam_instance.capture_thread and cam_instance.capture_thread.is_alive():
+            return
+        cam_instance.stop_event.clear()
+        with cam_instance.camera_lock:
+            width = cam_instance.camera.sensor_width_pixels
+            height = cam_instance.camera.sensor_height_pixels
+        with cam_instance.frame_lock:
+            self._allocate_frame_buffers(cam_instance, width, height)
+            cam_instance.write_idx = 0
+            cam_instance.frame_number = 0
+            cam_instance.displayed_frame_number = 0
+            cam_instance.fps_frame_number = 0
+            cam_instance.last_frame_time = time.monotonic()
+        cam_instance.capture_thread = threading.Thread(
+            target=self._capture_loop, args=(cam_id,), name=f"capture-{cam_id}", daemon=True)
+        cam_instance.capture_thread.start()
+    
+    def stop_capture(self, cam_id):
+        """Stop the background acquisition thread of a camera and wait for it to exit"""
+        cam_instance = self.cameras[cam_id]
+        cam_instance.stop_event.set()
+        if cam_instance.capture_thread:
+            # The thread may be blocked in get_pending_frame_or_null for up to image_poll_timeout_ms
+            cam_instance.capture_thread.join(timeout=2.0)
+            cam_instance.capture_thread = None
+    
+    def _allocate_frame_buffers(self, cam_instance, width, height):
+        """Allocate the 8-bit frame buffers of a camera (call with frame_lock held)"""
+        cam_instance.frame_slot = [np.zeros((height, width), dtype=np.uint8) for _ in range(2)]
     
-    def update_camera_frame(self, cam_id):
-        """Update frame for a specific camera"""
+    def _capture_loop(self, cam_id):
+        """Acquire frames from a camera until its stop event is set (runs in the capture thread)"""
         cam_instance = self.cameras[cam_id]
         
-        try:
-            # Use lock to ensure thread safety
-            with cam_instance.camera_lock:
-                if not cam_instance.camera:  # Double-check camera is still valid
-                    return
-                
-                # Don't try to get frames from all cameras at exactly the same time
-                # Add a tiny delay between cameras to avoid resource conflicts
-                if cam_id == "cam2":
-                    time.sleep(0.001)  # 1ms stagger between cameras
-                    
-                # Trigger acquisition of the next frame for live display
-                cam_instance.camera.issue_software_trigger()
-                # Get frame from camera
-                frame = cam_instance.camera.get_pending_frame_or_null()
-                
-            if frame is None:
+        with cam_instance.camera_lock:
+            if not cam_instance.camera:
                 return
-            
-            # Determine frame dimensions, fallback to camera sensor size if necessary
+            bit_depth = cam_instance.camera.bit_depth
+            sensor_width = cam_instance.camera.sensor_width_pixels
+            sensor_height = cam_instance.camera.sensor_height_pixels
+        
+        # Auto-contrast lookup table for high bit depth frames, rebuilt once a second
+        contrast_lut = None
+        next_lut_time = 0.0
+        
+        next_frame_time = time.monotonic()
+        while not cam_instance.stop_event.is_set():
             try:
-                width = frame.image_buffer_size_pixels_horizontal
-                height = frame.image_buffer_size_pixels_vertical
-            except AttributeError:
                 with cam_instance.camera_lock:
-                    width = cam_instance.camera.sensor_width_pixels
-                    height = cam_instance.camera.sensor_height_pixels
-            
-            with cam_instance.camera_lock:
-                bit_depth = cam_instance.camera.bit_depth
+                    if not cam_instance.camera:  # Double-check camera is still valid
+                        return
+                    # The camera free-runs after the trigger issued at arm time; wait for its next frame
+                    frame = cam_instance.camera.get_pending_frame_or_null()
+                
+                if frame is not None and not cam_instance.hw_frame_rate:
+                    # Without camera-side rate control, keep draining frames from the SDK but only
+                    # publish them at the requested rate
+                    now = time.monotonic()
+                    if now < next_frame_time:
+                        frame = None
+                    else:
+                        next_frame_time = max(next_frame_time + 1.0 / cam_instance.fps, now)
+                
+                if frame is not None:
+                    # Determine frame dimensions, fallback to camera sensor size if necessary
+                    try:
+                        width = frame.image_buffer_size_pixels_horizontal
+                        height = frame.image_buffer_size_pixels_vertical
+                    except AttributeError:
+                        width, height = sensor_width, sensor_height
+                    
+                    # View the SDK buffer without copying; it is copied once into our own buffer below
+                    raw = np.frombuffer(frame.image_buffer, dtype=np.uint8 if bit_depth <= 8 else np.uint16)
+                    assert not raw.flags.owndata, "SDK frame data was copied on ingest"
+                    raw = raw.reshape(height, width)
+                    
+                    use_lut = bit_depth > 8 and cam_instance.auto_contrast
+                    if use_lut and (contrast_lut is None or time.monotonic() >= next_lut_time):
+                        contrast_lut = self._contrast_lut(raw)
+                        next_lut_time = time.monotonic() + 1.0
+                    
+                    # Convert into the buffer the GUI is not reading, then flip
+                    with cam_instance.frame_lock:
+                        back = cam_instance.write_idx ^ 1
+                        if cam_instance.frame_slot[back].shape != (height, width):
+                            self._allocate_frame_buffers(cam_instance, width, height)
+                        buf = cam_instance.frame_slot[back]
+                        if bit_depth <= 8:
+                            np.copyto(buf, raw)
+                        elif use_lut:
+                            # One table lookup per pixel, straight into the 8-bit buffer
+                            np.take(contrast_lut, raw, out=buf, mode='clip')
+                        else:
+                            # For 10-16 bit images, keep the top 8 bits for display; the shift
+                            # runs as one vectorized pass straight into the 8-bit buffer
+                            np.right_shift(raw, bit_depth - 8, out=buf, casting='unsafe')
+                        cam_instance.write_idx = back
+                        cam_instance.frame_number += 1
+                    
+                    # Hand a copy to the writer thread; drop it rather than wait if the encoder lags
+                    if cam_instance.recording:
+                        try:
+                            rec_buf = cam_instance.free_bufs.get_nowait()
+                        except queue.Empty:
+                            rec_buf = None
+                        if rec_buf is None or rec_buf.shape != buf.shape:
+                            rec_buf = np.empty_like(buf)
+                        np.copyto(rec_buf, buf)
+                        try:
+                            cam_instance.write_queue.put_nowait(rec_buf)
+                        except queue.Full:
+                            cam_instance.dropped_frames += 1
+                            cam_instance.free_bufs.put(rec_buf)
+            except Exception as e:
+                error_msg = f"Error acquiring frame for {cam_instance.name}: {str(e)}"
+                logger.error(error_msg, exc_info=self.debug_mode)
+                self.capture_error.emit(cam_id, error_msg)
+                # Back off instead of spinning on a persistent error
+                cam_instance.stop_event.wait(0.5)
+    
+    def create_video_writer(self, filename, fps, width, height):
+        """Open a video writer, preferring hardware H.264 encoders over OpenCV's own writers
+        
+        Returns the writer and the input it takes: 'cuda' (a GpuMat for cv2.cudacodec) or
+        'gray' (a grayscale ndarray for AVVideoWriter and the single-channel cv2.VideoWriter).
+        """
+        try:
+            if cv2.cuda.getCudaEnabledDeviceCount() > 0:
+                params = cv2.cudacodec.EncoderParams()
+                params.nvPreset = cv2.cudacodec.ENC_PRESET_P3
+                params.rateControlMode = cv2.cudacodec.ENC_PARAMS_RC_VBR
+                params.targetQuality = 28
+                # Bound the keyframe interval to one second
+                params.gopLength = max(1, int(fps))
+                params.idrPeriod = max(1, int(fps))
+                writer = cv2.cudacodec.createVideoWriter(
+                    filename, (width, height), cv2.cudacodec.H264, fps,
+                    cv2.cudacodec.ColorFormat_GRAY, params)
+                logger.info(f"Recording with NVENC to {filename}")
+                return writer, 'cuda'
+        except (AttributeError, cv2.error) as e:
+            # OpenCV built without CUDA/cudacodec, or no usable NVENC device
+            logger.info(f"OpenCV NVENC writer unavailable: {e}")
+        
+        if av is not None:
+            for codec_name, pix_fmt, options in AV_H264_ENCODERS:
+                try:
+                    writer = AVVideoWriter(filename, codec_name, pix_fmt, fps, width, height, options)
+                    logger.info(f"Recording with {codec_name} to {filename}")
+                    return writer, 'gray'
+                except Exception as e:
+                    logger.info(f"Encoder {codec_name} unavailable: {e}")
+        
+        # Without PyAV, pipe raw frames into an ffmpeg executable if one is installed
+        if shutil.which('ffmpeg'):
+            try:
+                writer = FFmpegPipeWriter(filename, fps, width, height)
+                logger.info(f"Recording with ffmpeg ({writer.codec_name}) to {filename}")
+                return writer, 'gray'
+            except OSError as e:
+                logger.info(f"ffmpeg unavailable: {e}")
+        
+        logger.warning("No H.264 encoder available, falling back to OpenCV's video writer")
+        # isColor=False lets it take our grayscale frames without a BGR expansion; an unopened
+        # writer is returned if no codec works, for the caller to report
+        for fourcc in CV2_FOURCCS:
+            writer = cv2.VideoWriter(filename, cv2.VideoWriter_fourcc(*fourcc), fps, (width, height),
+                                     isColor=False)
+            if writer.isOpened():
+                msg = f"Recording with OpenCV {writer.getBackendName()} ({fourcc}) to {filename}"
+                logger.info(msg)
+                self.statusBar().showMessage(msg)
+                return writer, 'gray'
+            logger.info(f"OpenCV codec {fourcc} unavailable")
+        return writer, 'gray'
+    
+    def _contrast_lut(self, raw):
+        """Build a 16-bit to 8-bit lookup table that stretches the frame's min-max range to 0-255"""
+        lo, hi = int(raw.min()), int(raw.max())
+        levels = np.arange(65536, dtype=np.float32)
+        return np.clip((levels - lo) * (255.0 / max(hi - lo, 1)), 0, 255).astype(np.uint8)
+    
+    def _writer_loop(self, cam_id, video_writer, input_format, write_queue):
+        """Encode queued frames until None is queued, then release the writer (runs in the writer thread)"""
+        cam_instance = self.cameras[cam_id]
+        failed = False
+        gpu_frame = cv2.cuda_GpuMat() if input_format == 'cuda' else None
+        while True:
+            image = write_queue.get()
+            if image is None:
+                break
+            try:
+                # Keep draining after the frame limit or an error so the capture thread never blocks
+                if failed or (cam_instance.record_frame_limit > 0 and
+                              cam_instance.recorded_frame_count >= cam_instance.record_frame_limit):
+                    continue
+                if input_format == 'cuda':
+                    # The NVENC writer takes the grayscale frame directly from device memory
+                    gpu_frame.upload(image)
+                    video_writer.write(gpu_frame)
+                else:
+                    video_writer.write(image)
+                cam_instance.recorded_frame_count += 1
+            except Exception as e:
+                error_msg = f"Error writing video for {cam_instance.name}: {e}"
+                logger.error(error_msg, exc_info=self.debug_mode)
+                failed = True
+                self.writer_error.emit(cam_id, error_msg)
+            finally:
+                # The frame has been encoded (or skipped), so its buffer can be reused
+                cam_instance.free_bufs.put(image)
+        try:
+            video_writer.release()
+        except Exception as e:
+            logger.error(f"Error releasing video writer: {e}")
+    
+    def stop_writer(self, cam_id, timeout=0.5):
+        """Stop queueing frames and have the writer thread flush the queued ones to the file
+        
+        Waits at most timeout seconds. A writer still encoding after that finishes in the
+        background, polled by writer_flush_timer, so a slow encoder never freezes the window.
+        Returns True if the writer has finished.
+        """
+        cam_instance = self.cameras[cam_id]
+        cam_instance.recording = False
+        deadline = time.monotonic() + timeout
+        while not self._reap_writer(cam_id, 0.05):
+            if time.monotonic() >= deadline:
+                self.statusBar().showMessage(
+                    f"Saving {cam_instance.name} recording: {cam_instance.write_queue.qsize()} frames left to encode...")
+                cam_instance.writer_flush_timer.start(200)
+                return False
+        return True
+    
+    def _reap_writer(self, cam_id, wait):
+        """Queue the writer thread's stop sentinel if there is room and wait up to wait seconds for it to exit"""
+        cam_instance = self.cameras[cam_id]
+        writer_thread = cam_instance.writer_thread
+        if writer_thread is None:
+            return True
+        if writer_thread.is_alive() and not cam_instance.writer_stop_sent:
+            try:
+                # Never block here: the queue is full while the encoder is behind
+                cam_instance.write_queue.put_nowait(None)
+                cam_instance.writer_stop_sent = True
+            except queue.Full:
+                pass
+        writer_thread.join(wait)
+        if writer_thread.is_alive():
+            return False
+        cam_instance.writer_thread = None
+        cam_instance.video_writer = None
+        return True
+    
+    def poll_writer_flush(self, cam_id):
+        """Report on a writer thread flushing in the background and reap it once the file is complete"""
+        cam_instance = self.cameras[cam_id]
+        if self._reap_writer(cam_id, 0):
+            cam_instance.writer_flush_timer.stop()
+            self.statusBar().showMessage(f"Recording saved - {cam_instance.name}")
+        else:
+            self.statusBar().showMessage(
+                f"Saving {cam_instance.name} recording: {cam_instance.write_queue.qsize()} frames left to encode...")
+    
+    def refresh_displays(self):
+        """Repaint each camera that has published a frame since its last paint, called at ~30 Hz"""
+        for cam_id, cam_instance in self.cameras.items():
+            # frame_number moving past displayed_frame_number is the camera's dirty flag
+            if cam_instance.camera and cam_instance.frame_number != cam_instance.displayed_frame_number:
+                self.display_frame(cam_id)
+    
+    def display_frame(self, cam_id):
+        """Show and record the latest frame of a camera (runs in the GUI thread)"""
+        cam_instance = self.cameras[cam_id]
+        if not cam_instance.camera:
+            return
+        
+        try:
+            # While the encoder is more than half a queue behind, drop preview frames rather
+            # than recorded ones: skip the resize and paint, keep the recording bookkeeping
+            write_queue = cam_instance.write_queue
+            preview = not (cam_instance.recording and write_queue.qsize() > write_queue.maxsize // 2)
             
-            # Convert frame to numpy array
-            image_data = frame.image_buffer
+            # Hold the frame lock only while reading the buffer, so the capture thread
+            # cannot overwrite it mid-read
+            with cam_instance.frame_lock:
+                # Nothing to do until the capture thread publishes a frame we have not shown
+                if cam_instance.frame_number in (0, cam_instance.displayed_frame_number):
+                    return
+                cam_instance.displayed_frame_number = cam_instance.frame_number
+                image = cam_instance.frame_slot[cam_instance.write_idx]
+                if preview:
+                    display_buf = self._display_buffer(cam_instance, image.shape)
+                    height, width = image.shape
+                    interpolation = cv2.INTER_AREA if display_buf.shape[1] < width else cv2.INTER_LINEAR
+                    cv2.resize(image, (display_buf.shape[1], display_buf.shape[0]), dst=display_buf,
+                               interpolation=interpolation)
+            if preview:
+                # Outside the lock: display_buf belongs to the GUI thread
+                cv2.cvtColor(display_buf, cv2.COLOR_GRAY2BGRA, dst=cam_instance.display_bgrx)
             
-            # Create numpy array from image data
-            if bit_depth <= 8:
-                image = np.frombuffer(image_data, dtype=np.uint8).reshape(height, width)
-            else:
-                # For 16-bit images, we need to rescale to 8-bit for display
-                image = np.frombuffer(image_data, dtype=np.uint16).reshape(height, width)
-                image = cv2.normalize(image, None, 0, 255, cv2.NORM_MINMAX, dtype=cv2.CV_8U)
-            
-            # Store the latest frame
-            cam_instance.last_frame = image
-            
-            # Record video if needed
-            if cam_instance.recording and cam_instance.video_writer:
-                # OpenCV expects BGR format, but our image is grayscale
-                # Convert to BGR by duplicating the channels
-                color_image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
-                cam_instance.video_writer.write(color_image)
-                # Update recording duration and frame count
-                duration = time.time() - cam_instance.recording_start_time
-                cam_instance.recorded_frame_count += 1
-                cam_instance.recording_label.setText(f"Recording: {duration:.1f}s, Frames: {cam_instance.recorded_frame_count}")
+            # Frames are written by the writer thread; update recording duration and frame count
+            if cam_instance.recording:
+                now = time.monotonic()
+                duration = now - cam_instance.recording_start_time
+                # Repaint the label at 4 Hz rather than for every displayed frame
+                if now - cam_instance.last_label_update >= 0.25:
+                    cam_instance.last_label_update = now
+                    label = f"Recording: {duration:.1f}s, Frames: {cam_instance.recorded_frame_count}"
+                    if cam_instance.dropped_frames:
+                        # Frames the capture thread dropped because the write queue was full
+                        label += f", Dropped: {cam_instance.dropped_frames}"
+                    cam_instance.recording_label.setText(label)
                 # Auto-stop if limits reached
                 if ((cam_instance.record_duration_limit > 0 and duration >= cam_instance.record_duration_limit) or 
                     (cam_instance.record_frame_limit > 0 and cam_instance.recorded_frame_count >= cam_instance.record_frame_limit)):
                     self.toggle_recording(cam_id)
                     return
                 
-            # Display the image
-            q_image = QImage(image.data, width, height, width, QImage.Format_Grayscale8)
-            pixmap = QPixmap.fromImage(q_image)
-            
-            # Scale pixmap to fit the label while maintaining aspect ratio
-            cam_instance.image_label.setPixmap(pixmap.scaled(
-                cam_instance.image_label.width(), 
-                cam_instance.image_label.height(),
-                Qt.KeepAspectRatio,
-                Qt.SmoothTransformation
-            ))
-            
-            # Calculate and show actual FPS
-            cam_instance.frame_count += 1
-            elapsed = time.time() - cam_instance.last_frame_time
-            if elapsed >= 1.0:  # Update FPS display every second
-                actual_fps = cam_instance.frame_count / elapsed
-                cam_instance.fps_label.setText(f"{actual_fps:.1f}")
-                cam_instance.frame_count = 0
-                cam_instance.last_frame_time = time.time()
+            # The frame is already scaled to the label, so Qt only copies a label-sized image
+            if preview:
+                cam_instance.image_label.setPixmap(QPixmap.fromImage(cam_instance.display_qimage))
                 
         except Exception as e:
-            error_msg = f"Error acquiring frame for {cam_instance.name}: {str(e)}"
-            self.statusBar().showMessage(error_msg)
-            print(error_msg)
-            if self.debug_checkbox.isChecked():
-                traceback.print_exc()
-                cam_instance.debug_label.setText(f"Frame error: {error_msg}")
+            error_msg = f"Error displaying frame for {cam_instance.name}: {str(e)}"
+            logger.error(error_msg, exc_info=self.debug_mode)
+            self.show_capture_error(cam_id, error_msg)
+    
+    def _display_buffer(self, cam_instance, frame_shape):
+        """Return the display buffer of a camera, reallocating it when the label size changes"""
+        height, width = frame_shape
+        # Fit the frame in the label while maintaining aspect ratio
+        label_width, label_height = cam_instance.label_size
+        scale = min(label_width / width, label_height / height)
+        dw, dh = max(1, int(width * scale)), max(1, int(height * scale))
+        if cam_instance.display_buf is None or cam_instance.display_buf.shape != (dh, dw):
+            cam_instance.display_buf = np.zeros((dh, dw), dtype=np.uint8)
+            # RGB32 stores pixels as BGRX bytes on little-endian machines, matching OpenCV's BGRA
+            cam_instance.display_bgrx = np.zeros((dh, dw, 4), dtype=np.uint8)
+            cam_instance.display_qimage = QImage(cam_instance.display_bgrx.data, dw, dh, dw * 4,
+                                                 QImage.Format_RGB32)
+        return cam_instance.display_buf
+    
+    def recording_failed(self, cam_id, error_msg):
+        """Stop a recording whose writer thread could not encode a frame"""
+        cam_instance = self.cameras[cam_id]
+        if cam_instance.recording:
+            self.toggle_recording(cam_id)
+        cam_instance.recording_label.setText("Recording failed")
+        self.show_capture_error(cam_id, error_msg)
+        self.show_error(f"Recording Error - {cam_instance.name}",
+                        f"{error_msg}\nRecording stopped; the file contains the frames written before the error.")
+    
+    def show_capture_error(self, cam_id, error_msg):
+        """Report a frame acquisition or display error in the GUI"""
+        cam_instance = self.cameras[cam_id]
+        self.statusBar().showMessage(error_msg)
+        if self.debug_mode:
+            cam_instance.debug_label.setText(f"Frame error: {error_msg}")
+    
+    def update_fps_labels(self):
+        """Show the actual FPS of each connected camera, called once a second"""
+        now = time.monotonic()
+        for cam_instance in self.cameras.values():
+            if not cam_instance.camera:
+                continue
+            # Sample the capture thread's frame counter; nothing is timed per frame
+            frame_number = cam_instance.frame_number
+            elapsed = now - cam_instance.last_frame_time
+            if elapsed > 0:
+                actual_fps = (frame_number - cam_instance.fps_frame_number) / elapsed
+                cam_instance.fps_label.setText(f"{actual_fps:.1f}")
+            cam_instance.fps_frame_number = frame_number
+            cam_instance.last_frame_time = now
+            if self.debug_mode and cam_instance.recording:
+                cam_instance.debug_label.setText(
+                    f"{cam_instance.info_str}\n"
+                    f"Writer queue: {cam_instance.write_queue.qsize()}/{cam_instance.write_queue.maxsize}, "
+                    f"dropped frames: {cam_instance.dropped_frames}")
     
     def exposure_slider_changed(self, cam_id, value):
         """Handle exposure slider change for a specific camera"""
@@ -786,27 +1358,36 @@ class ThorlabsCameraApp(QMainWindow):
         self.set_exposure(cam_id, exposure_ms)
     
     def set_exposure(self, cam_id, value_ms):
-        """Set exposure for a specific camera"""
+        """Set exposure for a specific camera; the camera is updated once the value settles"""
         cam_instance = self.cameras[cam_id]
         cam_instance.exposure_ms = value_ms
         
+        # Update slider if value was changed directly
+        slider_value = int(value_ms * 10)
+        if cam_instance.exposure_slider.value() != slider_value:
+            cam_instance.exposure_slider.blockSignals(True)
+            cam_instance.exposure_slider.setValue(slider_value)
+            cam_instance.exposure_slider.blockSignals(False)
+        
+        # (Re)start the debounce timer so a slider drag results in a single SDK call
+        if cam_instance.camera:
+            cam_instance.exposure_apply_timer.start(50)
+    
+    def apply_exposure(self, cam_id):
+        """Push the pending exposure of a camera to the SDK"""
+        cam_instance = self.cameras[cam_id]
+        value_ms = cam_instance.exposure_ms
+        
         if cam_instance.camera:
             try:
                 # Convert from ms to μs for the camera
                 with cam_instance.camera_lock:
                     cam_instance.camera.exposure_time_us = int(value_ms * 1000)
                 cam_instance.status_label.setText(f"Exposure set to {value_ms} ms")
-                # Update slider if value was changed directly
-                slider_value = int(value_ms * 10)
-                if cam_instance.exposure_slider.value() != slider_value:
-                    cam_instance.exposure_slider.blockSignals(True)
-                    cam_instance.exposure_slider.setValue(slider_value)
-                    cam_instance.exposure_slider.blockSignals(False)
             except Exception as e:
                 error_msg = f"Error setting exposure: {str(e)}"
-                print(error_msg)
-                if self.debug_checkbox.isChecked():
-                    traceback.print_exc()
+                logger.error(error_msg, exc_info=self.debug_mode)
+                if self.debug_mode:
                     cam_instance.debug_label.setText(f"Exposure error: {error_msg}")
     
     def framerate_slider_changed(self, cam_id, value):
@@ -821,25 +1402,42 @@ class ThorlabsCameraApp(QMainWindow):
     def set_framerate(self, cam_id, fps):
         """Set framerate for a specific camera"""
         cam_instance = self.cameras[cam_id]
+        # Software pacing in the capture thread picks up the new rate on its next frame
         cam_instance.fps = fps
         
-        # Update the timer to use the faster of the two cameras' framerates
-        if self.cameras["cam1"].camera or self.cameras["cam2"].camera:
-            max_fps = max(
-                self.cameras["cam1"].fps if self.cameras["cam1"].camera else 0,
-                self.cameras["cam2"].fps if self.cameras["cam2"].camera else 0
-            )
-            if max_fps > 0:
-                if self.timer.isActive():
-                    self.timer.stop()
-                self.timer.start(int(1000 / max_fps))
-        
         cam_instance.status_label.setText(f"Frame rate set to {fps} FPS")
         # Update slider if value was changed directly
         if cam_instance.framerate_slider.value() != fps:
             cam_instance.framerate_slider.blockSignals(True)
             cam_instance.framerate_slider.setValue(fps)
             cam_instance.framerate_slider.blockSignals(False)
+        
+        # Like exposure, push the rate to the camera only once the slider has settled
+        if cam_instance.camera:
+            cam_instance.framerate_apply_timer.start(50)
+    
+    def apply_framerate(self, cam_id):
+        """Push the pending frame rate of a camera to its frame rate control"""
+        cam_instance = self.cameras[cam_id]
+        if cam_instance.camera:
+            with cam_instance.camera_lock:
+                cam_instance.hw_frame_rate = self._apply_frame_rate(cam_instance)
+    
+    def _apply_frame_rate(self, cam_instance):
+        """Set the camera's frame rate control to cam_instance.fps (call with camera_lock held)
+        
+        Returns False if the model has no frame rate control, in which case the capture thread
+        paces the frames it publishes instead.
+        """
+        try:
+            value_range = cam_instance.camera.frame_rate_control_value_range
+            cam_instance.camera.is_frame_rate_control_enabled = True
+            cam_instance.camera.frame_rate_control_value = min(max(cam_instance.fps, value_range.min),
+                                                               value_range.max)
+            return True
+        except Exception as e:
+            logger.info(f"Frame rate control unavailable on {cam_instance.name}, pacing in software: {e}")
+            return False
     
     def toggle_recording(self, cam_id):
         """Toggle recording for a specific camera"""
@@ -851,10 +1449,13 @@ class ThorlabsCameraApp(QMainWindow):
             
         if not cam_instance.recording:
             # Start recording
+            if cam_instance.writer_thread:
+                self.statusBar().showMessage(f"Still saving the previous {cam_instance.name} recording, please wait")
+                return
             try:
                 filename, _ = QFileDialog.getSaveFileName(
                     self, f"Save Video - {cam_instance.name}", 
-                    f"{cam_instance.name.lower().replace(' ', '_')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.mp4",
+                    f"{cam_instance.filename_prefix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.mp4",
                     "Video Files (*.mp4)"
                 )
                 if filename:
@@ -863,53 +1464,78 @@ class ThorlabsCameraApp(QMainWindow):
                         width = cam_instance.camera.sensor_width_pixels
                         height = cam_instance.camera.sensor_height_pixels
                     
-                    # Initialize video writer with MJPG codec which has good compatibility with MP4
-                    fourcc = cv2.VideoWriter_fourcc(*'MJPG')
                     # Ensure filename has .mp4 extension
                     if not filename.lower().endswith('.mp4'):
                         filename = filename + '.mp4'
                     
-                    cam_instance.video_writer = cv2.VideoWriter(
-                        filename, fourcc, cam_instance.fps, (width, height)
-                    )
+                    cam_instance.video_writer, input_format = self.create_video_writer(
+                        filename, cam_instance.fps, width, height)
                     
-                    if cam_instance.video_writer.isOpened():
-                        cam_instance.recording = True
-                        cam_instance.recording_start_time = time.time()
+                    if (not isinstance(cam_instance.video_writer, cv2.VideoWriter) or
+                            cam_instance.video_writer.isOpened()):
                         # Initialize recording limits
                         cam_instance.record_duration_limit = cam_instance.duration_spinbox.value()
                         cam_instance.record_frame_limit = cam_instance.framecount_spinbox.value()
                         cam_instance.recorded_frame_count = 0
+                        cam_instance.dropped_frames = 0
+                        # Preallocate a few frame copies so recording does not allocate per frame;
+                        # page-locked when they are uploaded to the GPU encoder
+                        alloc = empty_pinned if input_format == 'cuda' and empty_pinned else np.empty
+                        cam_instance.free_bufs = queue.Queue()
+                        for _ in range(4):
+                            cam_instance.free_bufs.put(alloc((height, width), dtype=np.uint8))
+                        # Start the writer thread before the capture thread begins queueing
+                        cam_instance.write_queue = queue.Queue(maxsize=cam_instance.queue_spinbox.value())
+                        cam_instance.writer_stop_sent = False
+                        cam_instance.writer_thread = threading.Thread(
+                            target=self._writer_loop,
+                            args=(cam_id, cam_instance.video_writer, input_format, cam_instance.write_queue),
+                            name=f"writer-{cam_id}", daemon=True)
+                        cam_instance.writer_thread.start()
+                        cam_instance.recording = True
+                        cam_instance.recording_start_time = time.monotonic()
                         cam_instance.record_button.setText("Stop Recording")
                         cam_instance.recording_label.setText("Recording started")
                         cam_instance.status_label.setText(f"Recording to {os.path.basename(filename)}")
                     else:
                         self.show_error("Recording Error", f"Failed to create video writer for {cam_instance.name}")
-                        print(f"Failed to open video writer for {filename}")
+                        logger.error(f"Failed to open video writer for {filename}")
+                        cam_instance.video_writer.release()
+                        cam_instance.video_writer = None
             except Exception as e:
                 error_msg = f"Recording error for {cam_instance.name}: {str(e)}"
-                print(error_msg)
-                traceback.print_exc()
+                logger.error(error_msg, exc_info=self.debug_mode)
                 cam_instance.debug_label.setText(f"Recording error: {error_msg}")
                 self.show_error(f"Recording Error - {cam_instance.name}", str(e))
+                # Close a writer opened before the failure, so its file and any ffmpeg process
+                # or encoder session are not leaked; once started, the writer thread owns it
+                if cam_instance.writer_thread:
+                    self.stop_writer(cam_id)
+                elif cam_instance.video_writer is not None:
+                    try:
+                        cam_instance.video_writer.release()
+                    except Exception as release_err:
+                        logger.error(f"Error releasing video writer: {release_err}")
                 cam_instance.video_writer = None
         else:
-            # Stop recording
-            if cam_instance.video_writer:
-                try:
-                    cam_instance.video_writer.release()
-                except Exception as e:
-                    print(f"Error releasing video writer: {e}")
-                cam_instance.video_writer = None
+            # Stop recording; the writer thread releases the video writer once the queue is flushed
+            self.stop_writer(cam_id)
             
-            cam_instance.recording = False
             cam_instance.record_button.setText("Start Recording")
             cam_instance.recording_label.setText("Not Recording")
             cam_instance.status_label.setText(f"Recording stopped - {cam_instance.name}")
     
+    def eventFilter(self, obj, event):
+        """Cache the size of the image labels when they are resized"""
+        if event.type() == QtCore.QEvent.Resize:
+            for cam_instance in self.cameras.values():
+                if obj is cam_instance.image_label:
+                    cam_instance.label_size = (event.size().width(), event.size().height())
+        return super().eventFilter(obj, event)
+    
     def show_error(self, title, message):
         """Display an error dialog with the given title and message"""
-        print(f"ERROR: {title} - {message}")
+        logger.error(f"ERROR: {title} - {message}")
         error_box = QMessageBox()
         error_box.setIcon(QMessageBox.Critical)
         error_box.setWindowTitle(title)
@@ -919,39 +1545,46 @@ class ThorlabsCameraApp(QMainWindow):
     
     def closeEvent(self, event):
         # Cleanup when application is closed
-        print("Application closing, cleaning up...")
+        logger.info("Application closing, cleaning up...")
         
-        # Stop the timer first
+        # Stop the timer and the capture threads first
         if self.timer.isActive():
             self.timer.stop()
+        self.display_timer.stop()
+        for cam_id in self.cameras:
+            self.stop_capture(cam_id)
+        # Let a running discovery finish with the SDK before it is disposed
+        if self.discovery_thread:
+            self.discovery_thread.wait()
         
         for cam_id, cam_instance in self.cameras.items():
-            if cam_instance.recording and cam_instance.video_writer:
-                try:
-                    print(f"Releasing video writer for {cam_id}")
-                    cam_instance.video_writer.release()
-                except Exception as e:
-                    print(f"Error releasing video writer for {cam_id}: {e}")
+            if cam_instance.recording or cam_instance.writer_thread:
+                logger.info(f"Releasing video writer for {cam_id}")
+                cam_instance.writer_flush_timer.stop()
+                # Give the encoder time to finish the file, but do not hang the exit on it
+                if not self.stop_writer(cam_id, timeout=10.0):
+                    cam_instance.writer_flush_timer.stop()
+                    logger.warning(f"Writer for {cam_id} did not finish; the recording may be incomplete")
             
             if cam_instance.camera:
                 try:
-                    print(f"Disposing camera {cam_id}")
+                    logger.info(f"Disposing camera {cam_id}")
                     cam_instance.camera.disarm()
                     cam_instance.camera.dispose()
                 except Exception as e:
-                    print(f"Error disposing camera {cam_id}: {e}")
+                    logger.error(f"Error disposing camera {cam_id}: {e}")
         
         # Add a small delay to ensure cameras are properly disposed
         time.sleep(0.5)
         
         if self.sdk:
             try:
-                print("Disposing SDK")
+                logger.info("Disposing SDK")
                 self.sdk.dispose()
             except Exception as e:
-                print(f"Error disposing SDK: {e}")
+                logger.error(f"Error disposing SDK: {e}")
         
-        print("Cleanup complete")
+        logger.info("Cleanup complete")
         event.accept()
 
 if __name__ == "__main__":